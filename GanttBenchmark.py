@@ -0,0 +1,370 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+import pandas as pd
+from matplotlib.backend_bases import MouseEvent
+
+from GanttViewer import GanttViewer, GTask, GDependencyArrow
+
+try:
+    import resource
+except ImportError:  # Not available on Windows, where peak memory is not reported
+    resource = None
+
+EPOCH = pd.Timestamp('2024-01-01')
+METRICS = ('construct_s', 'route_s', 'first_draw_s', 'redraw_s', 'first_hover_s', 'hover_mean_us', 'hover_max_us',
+           'peak_rss_mb')
+IMPORT_MODULES = ('GanttViewer', 'GanttLoader', 'GanttSnapshot', 'GanttExport')
+# Modules that only the code paths needing them may import, never importing the package itself
+HEAVY_MODULES = ('matplotlib.pyplot', 'matplotlib.widgets', 'pandas', 'sqlalchemy')
+
+
+def make_columns(n, seed=0):
+    """ Generate columns for n tasks with random start dates and durations
+
+    :param n: Number of tasks
+    :param seed: Random seed
+    :return: Tuple of (names, starts, ends, progress)
+    """
+    rng = np.random.default_rng(seed)
+    starts = EPOCH + pd.to_timedelta(rng.integers(0, 365, n), unit='D')
+    ends = starts + pd.to_timedelta(rng.integers(1, 30, n), unit='D')
+    names = [f'Task {i}' for i in range(n)]
+    return names, list(starts.strftime('%Y-%m-%d')), list(ends.strftime('%Y-%m-%d')), rng.random(n)
+
+
+def _schedule(starts, durations, groups, rng):
+    """ DataFrame of tasks from day offsets, with dates as ISO strings so loading includes date parsing """
+    starts = EPOCH + pd.to_timedelta(starts, unit='D')
+    ends = starts + pd.to_timedelta(durations, unit='D')
+    return pd.DataFrame({'name': [f'Task {i}' for i in range(len(starts))],
+                         'start': starts.strftime('%Y-%m-%d'), 'end': ends.strftime('%Y-%m-%d'),
+                         'progress': rng.random(len(starts)), 'group': groups})
+
+
+def make_chains(n, seed=0, length=25):
+    """ Generate independent chains of tasks, each starting a short gap after the one before it finishes
+
+    :param n: Number of tasks
+    :param seed: Random seed
+    :param length: Number of tasks per chain
+    :return: Tuple of (DataFrame of tasks, array of shape (m, 2) of predecessor and successor indices)
+    """
+    rng = np.random.default_rng(seed)
+    index = np.arange(n)
+    chain, position = index // length, index % length
+    durations = rng.integers(1, 10, n)
+    steps = durations + rng.integers(0, 3, n)
+    # Offset of each task within its chain is the running total of the steps before it in the same chain
+    totals = np.cumsum(steps) - steps
+    offsets = totals - totals[chain * length]
+    starts = rng.integers(0, 365, chain[-1] + 1 if n else 0)[chain] + offsets
+    groups = [f'Team {c % 10}' for c in chain.tolist()]
+    edges = np.column_stack((index[position > 0] - 1, index[position > 0]))
+    return _schedule(starts, durations, groups, rng), edges
+
+
+def make_dag(n, seed=0, width=None, fan=3):
+    """ Generate a layered dependency DAG with fan-in and fan-out, each task starting once all its predecessors in
+    the layer before have finished
+
+    :param n: Number of tasks
+    :param seed: Random seed
+    :param width: Number of tasks per layer, the square root of n if not given
+    :param fan: Most predecessors per task
+    :return: Tuple of (DataFrame of tasks, array of shape (m, 2) of predecessor and successor indices)
+    """
+    rng = np.random.default_rng(seed)
+    width = width or max(10, int(np.sqrt(n)))
+    durations = rng.integers(1, 8, n)
+    starts = np.zeros(n, dtype=np.int64)
+    starts[:width] = rng.integers(0, 30, min(width, n))
+    edges = []
+    for first in range(width, n, width):
+        size = min(width, n - first)
+        previous = np.arange(first - width, first)
+        chosen = previous[rng.integers(0, width, (size, fan))]
+        used = np.arange(fan) < rng.integers(1, fan + 1, size)[:, None]
+        ready = np.where(used, starts[chosen] + durations[chosen], 0).max(axis=1)
+        starts[first:first + size] = ready + rng.integers(0, 3, size)
+        successors = np.broadcast_to(np.arange(first, first + size)[:, None], chosen.shape)
+        edges.append(np.unique(np.column_stack((chosen[used], successors[used])), axis=0))
+    groups = [f'Layer {i // width % 10}' for i in range(n)]
+    edges = np.concatenate(edges) if edges else np.zeros((0, 2), dtype=np.int64)
+    return _schedule(starts, durations, groups, rng), edges
+
+
+def make_sprints(n, seed=0, sprint_days=14, per_sprint=40, dependency_rate=0.3):
+    """ Generate dense sprints of heavily overlapping tasks, with some tasks depending on an earlier one in the
+    same sprint
+
+    :param n: Number of tasks
+    :param seed: Random seed
+    :param sprint_days: Length of a sprint in days
+    :param per_sprint: Number of tasks per sprint
+    :param dependency_rate: Fraction of tasks with a predecessor
+    :return: Tuple of (DataFrame of tasks, array of shape (m, 2) of predecessor and successor indices)
+    """
+    rng = np.random.default_rng(seed)
+    index = np.arange(n)
+    sprint = index // per_sprint
+    starts = sprint * sprint_days + rng.integers(0, sprint_days - 1, n)
+    durations = rng.integers(1, sprint_days // 2, n)
+    # Sort each sprint by start so predecessors can be picked from the tasks that started earlier
+    order = np.lexsort((starts, sprint))
+    starts, durations = starts[order], durations[order]
+    position = index % per_sprint
+    dependent = (position > 0) & (rng.random(n) < dependency_rate)
+    predecessors = index - 1 - (rng.random(n) * position).astype(np.int64)
+    groups = [f'Team {t}' for t in rng.integers(0, 8, n).tolist()]
+    edges = np.column_stack((predecessors[dependent], index[dependent]))
+    return _schedule(starts, durations, groups, rng), edges
+
+
+GENERATORS = {'chains': make_chains, 'dag': make_dag, 'sprints': make_sprints}
+
+
+def _max_rss_mb():
+    """ Peak resident memory of this process so far, or None where it cannot be measured """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+def bench_case(generator, n, seed=0, render_mode='collection', lane_mode='row', moves=200, lod=False):
+    """ Time building, routing, drawing and hovering over one generated schedule on a headless Agg viewer
+
+    :param generator: Name of the schedule generator, a key of GENERATORS
+    :param n: Number of tasks
+    :param seed: Random seed of the schedule and the mouse moves
+    :param render_mode: Render mode of the viewer
+    :param lane_mode: Lane mode of the viewer
+    :param moves: Number of simulated mouse moves
+    :param lod: Draw with level of detail switching
+    :return: Dictionary of results
+    """
+    tasks, edges = GENERATORS[generator](n, seed)
+    gc.collect()
+    base_rss = _max_rss_mb()
+
+    start = time.perf_counter()
+    viewer = GanttViewer(render_mode=render_mode, lane_mode=lane_mode, blit=True, headless=True, lod=lod)
+    added = viewer.add_tasks(tasks)
+    constructed = time.perf_counter()
+    viewer.add_arrows(GDependencyArrow(added[a], added[b]) for a, b in edges.tolist())
+    routed = time.perf_counter()
+    canvas = viewer.fig.canvas
+    viewer.draw()
+    canvas.draw()
+    drawn = time.perf_counter()
+    canvas.draw()
+    redrawn = time.perf_counter()
+
+    # Mouse moves at random points over the axes, dispatched like real events so the handlers do all their work
+    rng = np.random.default_rng(seed)
+    x0, y0, width, height = viewer.ax.bbox.bounds
+    events = [MouseEvent('motion_notify_event', canvas, x, y)
+              for x, y in zip(x0 + width * rng.random(moves), y0 + height * rng.random(moves))]
+    durations = []
+    for event in events:
+        event_start = time.perf_counter()
+        canvas.callbacks.process('motion_notify_event', event)
+        durations.append(time.perf_counter() - event_start)
+    peak_rss = _max_rss_mb()
+
+    return {
+        'generator': generator,
+        'tasks': n,
+        'arrows': len(viewer.arrows),
+        'render_mode': render_mode,
+        'lane_mode': lane_mode,
+        'lod': lod,
+        'rows': viewer.lanes.row_count,
+        'construct_s': constructed - start,
+        'route_s': routed - constructed,
+        'first_draw_s': drawn - routed,
+        'redraw_s': redrawn - drawn,
+        # The first move also builds the hit index, so it is reported apart from the steady state
+        'first_hover_s': durations[0] if durations else None,
+        'hover_mean_us': 1e6 * float(np.mean(durations[1:])) if len(durations) > 1 else None,
+        'hover_max_us': 1e6 * float(np.max(durations[1:])) if len(durations) > 1 else None,
+        'peak_rss_mb': None if base_rss is None else peak_rss - base_rss,
+    }
+
+
+def run_isolated(**case):
+    """ Run bench_case in a fresh process, so peak memory and caches are not shared between cases
+
+    :param case: Keyword arguments for bench_case
+    :return: Dictionary of results
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+        return pool.submit(bench_case, **case).result()
+
+
+def bench_task_memory(n):
+    """ Measure the memory held per task, both for free-standing tasks and once they are in a viewer's task store
+
+    :param n: Number of tasks
+    :return: Dictionary of results
+    """
+    names, starts, ends, progress = make_columns(n)
+    viewer = GanttViewer(render_mode='collection')
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    tasks = GTask.from_columns(names, starts, ends, progress)
+    detached = tracemalloc.get_traced_memory()[0] - base
+    viewer.add_tasks(tasks)
+    gc.collect()
+    attached = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return {
+        'tasks': n,
+        'detached_bytes_per_task': detached / n,
+        'viewer_bytes_per_task': attached / n,
+        'store_bytes_per_task': viewer.store.nbytes / n,
+    }
+
+
+def bench_import(module, repeat=5):
+    """ Time importing a module in fresh interpreters and check which heavy modules come in with it
+
+    :param module: Name of the module
+    :param repeat: Number of interpreters to time the import in, the fastest is reported
+    :return: Dictionary of results
+    """
+    code = ('import json, sys, time\n'
+            'start = time.perf_counter()\n'
+            f'import {module}\n'
+            'elapsed = time.perf_counter() - start\n'
+            f'print(json.dumps([elapsed, [name for name in {HEAVY_MODULES!r} if name in sys.modules]]))')
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        elapsed, heavy = json.loads(output)
+        timings.append(elapsed)
+    return {'module': module, 'import_s': min(timings), 'heavy_modules': heavy}
+
+
+def environment():
+    """ Versions and commit the results were measured on
+
+    :return: Dictionary of environment details
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'matplotlib': matplotlib.__version__,
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+
+
+def compare(baseline, results, threshold=1.2):
+    """ Compare results against a baseline run, matching cases by generator, size and modes
+
+    :param baseline: Results of the baseline run
+    :param results: Results of this run
+    :param threshold: Ratio of new to old above which a metric counts as a regression
+    :return: List of (case, metric, old, new) for the regressions found
+    """
+    def case(result):
+        return (result['generator'], result['tasks'], result['render_mode'], result['lane_mode'],
+                result.get('lod', False))
+
+    old_results = {case(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        old = old_results.get(case(result))
+        if old is None:
+            continue
+        for metric in METRICS:
+            if old.get(metric) and result.get(metric) is not None and result[metric] / old[metric] > threshold:
+                regressions.append((case(result), metric, old[metric], result[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks for the Gantt viewer')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000, 100000],
+                        help='Numbers of tasks to benchmark')
+    parser.add_argument('--generators', nargs='+', choices=sorted(GENERATORS), default=sorted(GENERATORS),
+                        help='Schedule generators to benchmark')
+    parser.add_argument('--render-mode', choices=('patch', 'collection', 'virtual'), default='collection')
+    parser.add_argument('--lane-mode', choices=('row', 'packed', 'swimlane'), default='row')
+    parser.add_argument('--lod', action='store_true', help='Draw with level of detail switching')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--moves', type=int, default=200, help='Number of simulated mouse moves')
+    parser.add_argument('--in-process', action='store_true',
+                        help='Run every case in this process, peak memory is then not meaningful')
+    parser.add_argument('-o', '--output', help='File to save the results to as JSON')
+    parser.add_argument('--compare', help='JSON results of an earlier run to check for regressions against')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='Ratio of new to old above which a metric counts as a regression')
+    parser.add_argument('--task-memory', action='store_true', help='Only measure the memory held per task')
+    parser.add_argument('--import-time', action='store_true',
+                        help='Only time importing each module, failing if one imports pyplot, pandas or another heavy '
+                             'module at load')
+    args = parser.parse_args(argv)
+
+    if args.task_memory:
+        for n in args.sizes:
+            print(json.dumps(bench_task_memory(n)))
+        return 0
+    if args.import_time:
+        results = [bench_import(module) for module in IMPORT_MODULES]
+        for result in results:
+            print(json.dumps(result))
+        return 1 if any(result['heavy_modules'] for result in results) else 0
+
+    results = []
+    for generator in args.generators:
+        for n in args.sizes:
+            case = dict(generator=generator, n=n, seed=args.seed, render_mode=args.render_mode,
+                        lane_mode=args.lane_mode, moves=args.moves, lod=args.lod)
+            result = bench_case(**case) if args.in_process else run_isolated(**case)
+            if args.in_process:
+                result['peak_rss_mb'] = None
+            print(json.dumps(result), flush=True)
+            results.append(result)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'environment': environment(), 'results': results}, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline['results'], results, args.threshold)
+        for (generator, n, render_mode, lane_mode, _), metric, old, new in regressions:
+            print(f'{generator} {n} {render_mode} {lane_mode}: {metric} {old:.4g} -> {new:.4g} '
+                  f'({new / old:.2f}x)')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
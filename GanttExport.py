@@ -0,0 +1,140 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from GanttLoader import GScheduleLoader
+from GanttViewer import GanttViewer
+
+SCHEDULE_EXTENSIONS = ('.csv', '.json', '.jsonl')
+FORMATS = ('png', 'svg', 'pdf')
+
+
+def iter_schedules(inputs):
+    """ Expand files, directories and '-' (a stream of paths on stdin, one per line) into schedule file paths
+
+    :param inputs: Iterable of paths
+    :return: Generator of schedule file paths
+    """
+    for item in inputs:
+        if item == '-':
+            yield from iter_schedules(line.strip() for line in sys.stdin if line.strip())
+        elif os.path.isdir(item):
+            for name in sorted(os.listdir(item)):
+                if os.path.splitext(name)[1].lower() in SCHEDULE_EXTENSIONS:
+                    yield os.path.join(item, name)
+        else:
+            yield item
+
+
+def export_chart(source, out_dir, formats=('png',), dpi=100, figsize=(10, 6), render_mode='collection',
+                 lane_mode='row', chunksize=10000):
+    """ Render one schedule file to image files on a headless viewer
+
+    :param source: Path of the schedule file
+    :param out_dir: Directory to write the images to, named after the schedule file with its extension, such as
+                    plan.csv.png, so schedules differing only in extension do not overwrite each other
+    :param formats: Image formats to write
+    :param dpi: Resolution of raster images
+    :param figsize: Size of the figure in inches
+    :param render_mode: Render mode of the viewer
+    :param lane_mode: Lane mode of the viewer
+    :param chunksize: Number of tasks read and added at a time
+    :return: Dictionary of the outputs written and the time spent in each phase
+    """
+    start = time.perf_counter()
+    viewer = GanttViewer(figsize=figsize, render_mode=render_mode, lane_mode=lane_mode, headless=True)
+    GScheduleLoader(viewer, source, chunksize=chunksize).run()
+    built = time.perf_counter()
+    name = os.path.basename(source)
+    outputs = []
+    for fmt in formats:
+        output = os.path.join(out_dir, f'{name}.{fmt}')
+        viewer.save(output, format=fmt, dpi=dpi)
+        outputs.append(output)
+    rendered = time.perf_counter()
+    return {
+        'source': source,
+        'outputs': outputs,
+        'tasks': len(viewer.tasks),
+        'arrows': len(viewer.arrows),
+        'load_s': built - start,
+        'render_s': rendered - built,
+        'total_s': rendered - start,
+    }
+
+
+def _export_job(source, out_dir, options):
+    """ Process pool entry point, reporting failures rather than raising so one bad file does not stop the batch """
+    try:
+        return export_chart(source, out_dir, **options)
+    except Exception as error:
+        return {'source': source, 'error': f'{type(error).__name__}: {error}'}
+
+
+def export_many(sources, out_dir, workers=None, **options):
+    """ Render many schedule files, fanned out across a process pool. A file with the same name as an earlier one,
+    such as b/plan.csv after a/plan.csv, is reported as a failure rather than overwriting the earlier one's images.
+
+    :param sources: Iterable of schedule file paths
+    :param out_dir: Directory to write the images to
+    :param workers: Number of worker processes, one per CPU if not given, 0 to render in this process
+    :param options: Keyword arguments for export_chart
+    :return: Generator of result dictionaries in the order the charts finish
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    owners = {}
+
+    def clash(source):
+        name = os.path.normcase(os.path.basename(source))
+        if name in owners:
+            return {'source': source, 'error': f'Output name clashes with {owners[name]}'}
+        owners[name] = source
+        return None
+
+    if workers == 0:
+        for source in sources:
+            yield clash(source) or _export_job(source, out_dir, options)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for source in sources:
+            failure = clash(source)
+            if failure is not None:
+                yield failure
+            else:
+                futures.append(pool.submit(_export_job, source, out_dir, options))
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render schedule files to Gantt chart images')
+    parser.add_argument('inputs', nargs='+',
+                        help='Schedule files (.csv, .json, .jsonl), directories of them, or - to read paths from stdin')
+    parser.add_argument('-o', '--out-dir', default='.', help='Directory to write the images to')
+    parser.add_argument('-f', '--format', dest='formats', nargs='+', choices=FORMATS, default=['png'],
+                        help='Image formats to write')
+    parser.add_argument('--dpi', type=int, default=100, help='Resolution of raster images')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of worker processes, one per CPU by default, 0 to render in this process')
+    parser.add_argument('--render-mode', choices=('patch', 'collection'), default='collection')
+    parser.add_argument('--lane-mode', choices=('row', 'packed', 'swimlane'), default='row')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = export_many(iter_schedules(args.inputs), args.out_dir, workers=args.workers, formats=args.formats,
+                          dpi=args.dpi, render_mode=args.render_mode, lane_mode=args.lane_mode)
+    charts = failures = 0
+    for result in results:
+        print(json.dumps(result), flush=True)
+        charts += 1
+        failures += 'error' in result
+    print(json.dumps({'charts': charts, 'failures': failures, 'wall_s': time.perf_counter() - start}))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
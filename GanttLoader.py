@@ -0,0 +1,230 @@
+import os
+import queue
+import threading
+import time
+
+from GanttViewer import GTask, GDependencyArrow
+
+DEPENDENCY_COLUMNS = ('predecessors', 'depends_on')
+
+
+def read_chunks(path, chunksize=10000):
+    """ Read a schedule file as a stream of DataFrames of at most chunksize rows
+
+    :param path: Path of a .csv, .jsonl or .json file
+    :param chunksize: Number of rows per chunk
+    :return: Generator of DataFrames
+    """
+    import pandas as pd
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        with pd.read_csv(path, chunksize=chunksize, dtype={'name': str}) as reader:
+            yield from reader
+    elif extension == '.jsonl':
+        with pd.read_json(path, lines=True, chunksize=chunksize, dtype=False) as reader:
+            yield from reader
+    elif extension == '.json':
+        # A JSON document cannot be parsed incrementally, so it is read whole and handed on in slices
+        frame = pd.read_json(path, dtype=False)
+        for first in range(0, len(frame), chunksize):
+            yield frame.iloc[first:first + chunksize]
+    else:
+        raise ValueError(f"Unknown schedule file type '{extension}'")
+
+
+def _split_names(value, separator):
+    """ Predecessor names from a cell holding a separated string, a list or nothing """
+    if isinstance(value, str):
+        return [name.strip() for name in value.split(separator) if name.strip()]
+    if isinstance(value, (list, tuple)):
+        return [str(name) for name in value]
+    return []
+
+
+def parse_chunks(chunks, separator=';'):
+    """ Turn DataFrame chunks into tasks and the names of the tasks they depend on
+
+    :param chunks: Iterable of DataFrames with name, start, end and optionally progress, group and predecessors
+                   (or depends_on) columns
+    :param separator: Separator between names in a predecessors string
+    :return: Generator of (list of tasks, list of (predecessor name, task)) per chunk
+    """
+    for frame in chunks:
+        tasks = GTask.from_columns(frame['name'], frame['start'], frame['end'],
+                                   frame['progress'] if 'progress' in frame else None,
+                                   groups=frame['group'] if 'group' in frame else None)
+        links = []
+        column = next((column for column in DEPENDENCY_COLUMNS if column in frame), None)
+        if column is not None:
+            for task, value in zip(tasks, frame[column]):
+                links.extend((name, task) for name in _split_names(value, separator))
+        yield tasks, links
+
+
+class GScheduleLoader:
+    """ Streams a schedule file into a viewer chunk by chunk. Parsing runs in a worker thread that hands chunks to
+    the GUI thread through a bounded queue, so at most prefetch chunks are held in memory ahead of the viewer.
+    Dependencies may name tasks further down the file; those are kept waiting until the task arrives.
+    """
+
+    def __init__(self, viewer, path, chunksize=10000, prefetch=2, separator=';', add_tasks=None):
+        """ Schedule loader
+
+        :param viewer: Gantt chart viewer to load the tasks into
+        :param path: Path of a .csv, .jsonl or .json schedule file
+        :param chunksize: Number of tasks per chunk
+        :param prefetch: Number of parsed chunks the worker may run ahead of the viewer
+        :param separator: Separator between names in a predecessors string
+        :param add_tasks: Function adding a list of tasks to the viewer, such as a table model's, viewer.add_tasks
+                          if not given
+        """
+        self.viewer = viewer
+        self.path = path
+        self.chunksize = chunksize
+        self.separator = separator
+        self.add_tasks = add_tasks if add_tasks is not None else viewer.add_tasks
+        self.task_count = 0
+        self.arrow_count = 0
+        self.done = False
+        self._tasks_by_name = {}
+        self._waiting = {}
+        self._queue = queue.Queue(maxsize=prefetch)
+        self._thread = None
+        self._cancelled = threading.Event()
+        self._error = None
+        self._timer = None
+
+    @property
+    def unresolved(self):
+        """ Names of predecessors that have not been loaded (yet) """
+        return list(self._waiting)
+
+    def _chunks(self):
+        """ Parsed chunks, each with the seconds spent reading and parsing it, which happens as the generator is
+        advanced. Timings are only taken here, since this may run on the worker thread.
+        """
+        chunks = parse_chunks(read_chunks(self.path, self.chunksize), self.separator)
+        while True:
+            start = time.perf_counter()
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            yield chunk + (time.perf_counter() - start,)
+
+    def _add(self, tasks, links, parse_time):
+        """ Add a parsed chunk to the viewer, linking it to the tasks already loaded
+
+        :param tasks: Tasks of the chunk
+        :param links: List of (predecessor name, task) of the chunk
+        :param parse_time: Seconds spent reading and parsing the chunk, recorded in the viewer's stats
+        :return: None
+        """
+        if self.viewer.stats is not None:
+            self.viewer.stats.record('parse', parse_time)
+        arrows = []
+        for task in tasks:
+            name = task.name
+            self._tasks_by_name[name] = task
+            for successor in self._waiting.pop(name, ()):
+                arrows.append(GDependencyArrow(task, successor))
+        for name, task in links:
+            predecessor = self._tasks_by_name.get(name)
+            if predecessor is None:
+                self._waiting.setdefault(name, []).append(task)
+            else:
+                arrows.append(GDependencyArrow(predecessor, task))
+        # Not batched together, so the tasks are in the store by the time a table model announces their rows
+        self.add_tasks(tasks)
+        self.viewer.add_arrows(arrows)
+        self.task_count += len(tasks)
+        self.arrow_count += len(arrows)
+
+    def run(self):
+        """ Load the whole file on the calling thread
+
+        :return: Number of tasks loaded
+        """
+        for chunk in self._chunks():
+            self._add(*chunk)
+        self.done = True
+        return self.task_count
+
+    def _produce(self):
+        try:
+            for chunk in self._chunks():
+                if self._cancelled.is_set():
+                    return
+                self._queue.put(chunk)
+        except Exception as error:
+            self._error = error
+        finally:
+            self._queue.put(None)
+
+    def start(self):
+        """ Start parsing in a worker thread, chunks are then added to the viewer by poll
+
+        :return: None
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._produce, name='GScheduleLoader', daemon=True)
+            self._thread.start()
+
+    def poll(self, max_chunks=1):
+        """ Add the chunks the worker has parsed so far to the viewer, must be called on the GUI thread
+
+        :param max_chunks: Most chunks to add in this call
+        :return: Number of chunks added
+        """
+        added = 0
+        while added < max_chunks and not self.done:
+            try:
+                chunk = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if chunk is None:
+                self.done = True
+                if self._error is not None:
+                    raise self._error
+                break
+            self._add(*chunk)
+            added += 1
+        return added
+
+    def cancel(self):
+        """ Stop the worker and drop the chunks it has parsed but not yet handed over
+
+        :return: None
+        """
+        self._cancelled.set()
+        if self._timer is not None:
+            self._timer.stop()
+        while self._thread is not None and self._thread.is_alive():
+            try:
+                self._queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        self.done = True
+
+    def attach(self, interval=50, max_chunks=1, on_done=None):
+        """ Load in the background, adding chunks from a canvas timer and redrawing as the chart grows
+
+        :param interval: Milliseconds between polls
+        :param max_chunks: Most chunks to add per poll, keeping each poll short enough for the GUI to stay responsive
+        :param on_done: Function called with the loader once the whole file is loaded
+        :return: None
+        """
+        def tick():
+            try:
+                added = self.poll(max_chunks)
+            finally:
+                if self.done:
+                    self._timer.stop()
+            if added:
+                self.viewer.draw()
+            if self.done and on_done is not None:
+                on_done(self)
+
+        self._timer = self.viewer.fig.canvas.new_timer(interval=interval)
+        self._timer.add_callback(tick)
+        self.start()
+        self._timer.start()
@@ -0,0 +1,157 @@
+import gc
+import json
+import os
+
+import matplotlib.path as mpath
+import numpy as np
+
+from GanttViewer import GanttViewer, GArrowPool, GTaskStore
+
+FORMAT_VERSION = 1
+
+# Building the paths of a large snapshot with the Path constructor takes several times longer than the rest of the
+# load, which its validation of each slice accounts for. Path._fast_from_codes_and_verts skips that validation, but
+# being private it may go away in a later Matplotlib, in which case the public constructor is used instead.
+_FAST_PATH = getattr(mpath.Path, '_fast_from_codes_and_verts', None)
+
+
+def _path_codes(path):
+    """ Codes of a path, spelling out the implicit move-then-lines of a path without codes """
+    if path.codes is not None:
+        return path.codes
+    codes = np.full(len(path.vertices), mpath.Path.LINETO, dtype=mpath.Path.code_type)
+    codes[0] = mpath.Path.MOVETO
+    return codes
+
+
+def save_snapshot(viewer, directory):
+    """ Write a viewer's tasks, dependencies, lane layout and routed arrows to a directory of .npy files that
+    load_snapshot can open without parsing dates, laying out lanes or routing arrows. Swimlane groups have to be
+    JSON values.
+
+    :param viewer: Gantt chart viewer to save
+    :param directory: Directory to write the snapshot to, created if missing
+    :return: None
+    """
+    if viewer.lanes.stale:
+        viewer.relayout()
+    viewer.route_arrows()
+    store = viewer.store
+    n = len(store)
+    os.makedirs(directory, exist_ok=True)
+
+    def save(name, array):
+        np.save(os.path.join(directory, name), array)
+
+    save('tasks.npy', store._data[:, :n])
+    save('names.npy', np.array(store.names, dtype=str))
+    groups = {}
+    save('groups.npy', np.array([groups.setdefault(task.group, len(groups)) for task in store.tasks], dtype=np.int32))
+
+    arrows = viewer.arrows
+    save('edges.npy', np.array([(arrow.start_task._index, arrow.end_task._index) for arrow in arrows],
+                               dtype=np.int64).reshape(-1, 2))
+    save('heads.npy', np.array([arrow.head[0] + arrow.head[1] for arrow in arrows], dtype=float).reshape(-1, 4))
+    lengths = [len(arrow.path.vertices) for arrow in arrows]
+    save('path_offsets.npy', np.concatenate(([0], np.cumsum(lengths, dtype=np.int64))))
+    save('vertices.npy', np.concatenate([arrow.path.vertices for arrow in arrows]) if arrows else np.zeros((0, 2)))
+    save('boxes.npy', np.array([GArrowPool._box(arrow.path) for arrow in arrows], dtype=float).reshape(-1, 4))
+    save('codes.npy', np.concatenate([_path_codes(arrow.path) for arrow in arrows]) if arrows
+         else np.zeros(0, dtype=mpath.Path.code_type))
+    # The routes are cached under the bars they were routed around, so record those fingerprints too, and for
+    # legacy routing the gap between bars each arrow was routed with
+    data = store._data
+    fingerprints = [viewer.obstacles.fingerprint(*sorted((data[GTaskStore.ROW, arrow.start_task._index],
+                                                          data[GTaskStore.ROW, arrow.end_task._index])))
+                    for arrow in arrows]
+    save('fingerprints.npy', np.array(fingerprints, dtype=np.int64))
+    if viewer.router is None:
+        save('gaps.npy', np.array([arrow._task_gap for arrow in arrows], dtype=float))
+
+    meta = {
+        'format': FORMAT_VERSION,
+        'tasks': n,
+        'arrows': len(arrows),
+        'routing': 'orthogonal' if viewer.router is not None else 'legacy',
+        'lane_mode': viewer.lanes.mode,
+        'spacing': viewer.lanes.spacing,
+        'row_count': viewer.lanes.row_count,
+        'bands': viewer.lanes.bands(),
+        'groups': list(groups),
+    }
+    # Written last, so a snapshot interrupted part way through is not mistaken for a complete one
+    with open(os.path.join(directory, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+
+
+def load_snapshot(directory, render_mode='virtual', mmap=True, **options):
+    """ Open a snapshot written by save_snapshot in a new viewer
+
+    :param directory: Directory of the snapshot
+    :param render_mode: 'collection' or 'virtual', 'virtual' only creates artists for the arrows in view
+    :param mmap: Memory-map the arrow paths rather than reading them into memory
+    :param options: Other keyword arguments for GanttViewer, such as figsize, blit or headless
+    :return: GanttViewer showing the snapshot
+    """
+    with open(os.path.join(directory, 'meta.json')) as f:
+        meta = json.load(f)
+    if meta['format'] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format {meta['format']}")
+    # Loading creates a few objects per task and arrow, none of them garbage, and the collector passes triggered
+    # along the way would take longer than the load itself
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _load(directory, meta, render_mode, mmap, options)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _load(directory, meta, render_mode, mmap, options):
+    mmap_mode = 'r' if mmap else None
+
+    def load(name, mmap_mode=None):
+        return np.load(os.path.join(directory, name), mmap_mode=mmap_mode)
+
+    data = load('tasks.npy', mmap_mode)
+    names = load('names.npy').tolist()
+    values = meta['groups']
+    groups = None if values in ([], [None]) else [values[code] for code in load('groups.npy').tolist()]
+
+    edges = load('edges.npy')
+    offsets = load('path_offsets.npy')
+    # Plain arrays over the mapped buffers, slicing a memmap goes through Python for every slice
+    vertices = load('vertices.npy', mmap_mode).view(np.ndarray)
+    codes = load('codes.npy', mmap_mode).view(np.ndarray)
+    # Paths are slices of the vertex and code buffers. The saved paths were valid already, so the checks of the Path
+    # constructor are skipped where Matplotlib allows it. Arrow paths are short and curved, so like the routed ones
+    # they are never simplified, which the template passes on.
+    bounds = zip(offsets[:-1].tolist(), offsets[1:].tolist())
+    if _FAST_PATH is not None:
+        template = mpath.Path(np.zeros((1, 2)))
+        paths = [_FAST_PATH(vertices[lo:hi], codes[lo:hi], template) for lo, hi in bounds]
+    else:
+        paths = [mpath.Path(vertices[lo:hi], codes[lo:hi], readonly=True) for lo, hi in bounds]
+    heads = [((x0, y0), (x1, y1)) for x0, y0, x1, y1 in load('heads.npy').tolist()]
+    routes = list(zip(paths, heads))
+    boxes = load('boxes.npy')
+
+    keys = gaps = None
+    if len(paths):
+        starts, ends = edges[:, 0], edges[:, 1]
+        points = zip(data[GTaskStore.END, starts].tolist(), data[GTaskStore.ROW, starts].tolist(),
+                     data[GTaskStore.START, ends].tolist(), data[GTaskStore.ROW, ends].tolist(),
+                     load('fingerprints.npy').tolist())
+        if meta['routing'] == 'orthogonal':
+            keys = [('orthogonal', (x0, y0), (x1, y1), fingerprint) for x0, y0, x1, y1, fingerprint in points]
+        else:
+            gaps = load('gaps.npy').tolist()
+            keys = [('legacy', (x0, y0), (x1, y1), gap, fingerprint)
+                    for (x0, y0, x1, y1, fingerprint), gap in zip(points, gaps)]
+
+    viewer = GanttViewer(render_mode=render_mode, lane_mode=meta['lane_mode'], routing=meta['routing'], **options)
+    viewer.lanes.spacing = meta['spacing']
+    bands = [(group, first, count) for group, first, count in meta['bands']]
+    viewer._restore(data, names, groups, (meta['row_count'], bands), edges, routes, keys, boxes, gaps)
+    return viewer
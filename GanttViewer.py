@@ -1,186 +1,3756 @@
-import matplotlib.pyplot as plt
-import pandas as pd
+# pyplot, pandas, the widgets and the figure classes are imported where first needed, so importing the module stays
+# quick for tools that never show a window or parse a date
 import matplotlib.dates as mdates
 from datetime import timedelta
-from matplotlib.widgets import Slider
 import matplotlib.patches as patches
 import matplotlib.path as mpath
-import matplotlib.lines as lines
-from sqlalchemy import false
+import matplotlib.colors as mcolors
+from matplotlib.artist import Artist
+from matplotlib.collections import PolyCollection
+import numpy as np
+import bisect
+import heapq
+import itertools
+import logging
+import math
+import sys
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager, nullcontext
+
+_NO_PHASE = nullcontext()  # Stands in for a GStats phase when stats are off
+_NOWHERE = (math.inf, -math.inf, math.inf, -math.inf)  # Window that no arrow intersects
 
 
 class GanttViewer:
-    def __init__(self, figsize=(10, 6)):
-        self.fig, self.ax = plt.subplots(figsize=figsize)
+    def __init__(self, figsize=(10, 6), render_mode='patch', blit=False, lane_mode='row', group_key=None,
+                 routing='orthogonal', headless=False, tiles=False, stats=False, embedded=False, lod=False):
+        """ Gantt chart viewer
+
+        :param figsize: Size of the figure
+        :param render_mode: 'patch' draws each task as its own pair of patches, 'collection' batches all the task
+                            bars and progress overlays into two collections, 'virtual' is 'collection' but only
+                            materialises the bars and arrows near the current view
+        :param blit: Show hover and selection on an animated overlay blitted over a cached background, instead of
+                     redrawing the whole figure
+        :param lane_mode: How tasks are given rows, see GLaneLayout
+        :param group_key: Function giving the swimlane of a task in 'swimlane' lane mode
+        :param routing: 'orthogonal' routes arrows with GOrthogonalRouter, 'legacy' with the original per-arrow
+                        geometric cases
+        :param headless: Build the figure on an Agg canvas without going through pyplot, for rendering straight to
+                         files; show() is not available
+        :param tiles: Compose horizontal scrolling from cached tiles with GTileCache instead of redrawing the whole
+                      figure, needs blit so hover feedback is not baked into the tiles
+        :param stats: Collect timings and counters in a GStats, see enable_stats
+        :param embedded: Build a plain figure for the caller to put on its own canvas, such as a Qt FigureCanvas,
+                         without going through pyplot; show() is not available
+        :param lod: Switch to plain rectangles and then density strips as the view zooms out, see GLevelOfDetail
+        """
+        if render_mode not in ('patch', 'collection', 'virtual'):
+            raise ValueError(f"Unknown render mode '{render_mode}'")
+        if routing not in ('orthogonal', 'legacy'):
+            raise ValueError(f"Unknown routing '{routing}'")
+        if tiles and not blit:
+            raise ValueError("Tiled scrolling needs blit")
+        self.headless = headless
+        self.embedded = embedded
+        if headless or embedded:
+            # Not registered with pyplot, so nothing is shared between charts and the figure is freed with the viewer
+            from matplotlib.figure import Figure
+            self.fig = Figure(figsize=figsize)
+            if headless:
+                from matplotlib.backends.backend_agg import FigureCanvasAgg
+                FigureCanvasAgg(self.fig)
+            self.ax = self.fig.add_subplot()
+        else:
+            import matplotlib.pyplot as plt
+            self.fig, self.ax = plt.subplots(figsize=figsize)
         self.fig.subplots_adjust(bottom=0.2, right=0.8)
-        self.tasks = []
+        self.render_mode = render_mode
+        self.tasks = []  # In the order of the store, so a task's store index is also its index here
         self.arrows = []
+        self._task_arrows = {}  # Arrows to and from each task, keyed by task
         self.scrollbars = []
+        self._bars = GBarCollection(self.ax) if render_mode in ('collection', 'virtual') else None
+        self._arrow_pool = GArrowPool(self.ax) if render_mode == 'virtual' else None
+        self._window = None
+        self.layout = GRowLayout()
+        self.lanes = GLaneLayout(lane_mode, group_key)
+        self._band_artists = []
+        self.store = GTaskStore(self.layout)
+        self.graph = GDependencyGraph(self.store)
+        self.obstacles = GObstacleIndex(self.store, self.layout)
+        self.path_cache = GPathCache()
+        self.router = GOrthogonalRouter(self.obstacles, self.path_cache) if routing == 'orthogonal' else None
+        self._routed_version = -1  # Store version the arrows were last routed against
+        self.store.on_dates_changed = self._dates_changed
+        self._highlight_critical = None
+        self._hit_index = GHitIndex()
+        self._hover_task = None
+        self._hover_arrow = None
+        self._pressed_task = None
+        self._batch_depth = 0
+        self._pending_tasks = []
+        self._pending_arrows = []
+        self._overlay = GBlitOverlay(self) if blit else None
+        self._tiles = GTileCache(self) if tiles else None
+        self._lod = GLevelOfDetail(self) if lod else None
+        self.stats = None
+        self._stats_ids = []
+        self._stats_mark = None
+        self._stats_text = None
+        self.connect_events()
+        if stats:
+            self.enable_stats()
+        self._cull_ids = []
+        if self._arrow_pool is not None:
+            self._cull_ids = [self.ax.callbacks.connect('xlim_changed', self._cull),
+                              self.ax.callbacks.connect('ylim_changed', self._cull)]
+            self._cull()
+
+    def add_task(self, task):
+        if self._batch_depth:
+            self._pending_tasks.append(task)
+            return
+        self._place_tasks([task])
+        self._hit_index.invalidate()
+        self._update_lod()
+
+    def _place_tasks(self, tasks):
+        """ Give tasks their rows and create their artists and geometry
+
+        :param tasks: Tasks to place
+        :return: None
+        """
+        if self.stats is not None:
+            self.stats.count('tasks_drawn', len(tasks))
+        with self._phase('place_tasks'):
+            rows = self.lanes.assign(tasks, mdates.date2num([task._start for task in tasks]),
+                                     mdates.date2num([task._end for task in tasks]))
+            for task, row in zip(tasks, rows):
+                self._place_task(task, row)
+        if self.lanes.stale:
+            self.relayout()
+
+    def _place_task(self, task, row):
+        """ Create the artists and geometry for a task
+
+        :param task: Task to place
+        :param row: Row of the task
+        :return: None
+        """
+        self.tasks.append(task)
+        if self._bars is not None:
+            task.row = row
+            self.store.add(task)
+            self._bars.add(task)
+        else:
+            # The viewer sets the axis limits itself when drawing, so skip the per-patch data limit update
+            task.draw(self.ax, autolim=False, row=row)
+            self.store.add(task)
+
+    def relayout(self):
+        """ Work out the row of every task again from scratch, moving only the tasks whose row changes
+
+        :return: None
+        """
+        with self._phase('relayout'):
+            rows = self.lanes.layout(self.store.tasks, self.store.start_x, self.store.end_x)
+            old_rows = self.store.row_y.tolist()
+            for task, row, old_row in zip(list(self.store.tasks), rows, old_rows):
+                if row != old_row:
+                    task.row = row
+        self._hit_index.invalidate()
+
+    def set_lane_mode(self, mode, group_key=None):
+        """ Switch how tasks are given rows and lay out every task again
+
+        :param mode: 'row', 'packed' or 'swimlane'
+        :param group_key: Function giving the swimlane of a task in 'swimlane' mode
+        :return: None
+        """
+        self.lanes = GLaneLayout(mode, group_key, self.lanes.spacing)
+        self.relayout()
+
+    def add_tasks(self, tasks):
+        """ Add many tasks at once, building all their artists in a single pass
+
+        :param tasks: Iterable of GTask, or a DataFrame with name, start, end and optionally progress and group
+                      columns
+        :return: List of the tasks added
+        """
+        # Only a caller that has imported pandas can have passed a DataFrame
+        pd = sys.modules.get('pandas')
+        if pd is not None and isinstance(tasks, pd.DataFrame):
+            with self._phase('parse'):
+                tasks = GTask.from_columns(tasks['name'], tasks['start'], tasks['end'],
+                                           tasks['progress'] if 'progress' in tasks else None,
+                                           groups=tasks['group'] if 'group' in tasks else None)
+        else:
+            tasks = list(tasks)
+        with self.batch():
+            for task in tasks:
+                self.add_task(task)
+        return tasks
+
+    def add_arrows(self, arrows):
+        """ Add many dependency arrows at once, routing and drawing them in a single pass
+
+        :param arrows: Iterable of GDependencyArrow
+        :return: List of the arrows added
+        """
+        arrows = list(arrows)
+        with self.batch():
+            for arrow in arrows:
+                self.add_arrow(arrow)
+        return arrows
+
+    @contextmanager
+    def batch(self):
+        """ Context manager that defers drawing of tasks and arrows added inside it until it exits, e.g.
+
+            with viewer.batch():
+                for task in tasks:
+                    viewer.add_task(task)
+
+        :return: The viewer
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._flush()
+
+    def _flush(self):
+        """ Place everything added during a batch, tasks first so the arrows can be routed around them
+
+        :return: None
+        """
+        tasks, self._pending_tasks = self._pending_tasks, []
+        arrows, self._pending_arrows = self._pending_arrows, []
+        if tasks:
+            self._place_tasks(tasks)
+        if arrows:
+            # Keep every route cached, as route_all does, so the next full pass does not route them all again
+            self.path_cache.maxsize = max(self.path_cache.maxsize, 2 * (len(self.arrows) + len(arrows)))
+        for arrow in arrows:
+            self._place_arrow(arrow)
+        if tasks or arrows:
+            self._hit_index.invalidate()
+            self._update_lod()
+        if arrows:
+            self._dependencies_changed()
+
+    def remove_task(self, task):
+        """ Remove a task along with every arrow to or from it
+
+        :param task: Task to remove
+        :return: None
+        """
+        self.remove_tasks([task])
+
+    def remove_tasks(self, tasks):
+        """ Remove many tasks along with every arrow to or from them, closing the gaps they leave in the task store
+        in a single pass
+
+        :param tasks: Iterable of tasks, tasks not in the viewer are ignored
+        :return: None
+        """
+        placed = {}
+        pending = set()
+        for task in tasks:
+            if task._store is self.store:
+                placed[id(task)] = task
+            else:
+                pending.add(id(task))
+        if pending:
+            self._pending_tasks = [task for task in self._pending_tasks if id(task) not in pending]
+        gone = pending | placed.keys()
+        if self._pending_arrows:
+            self._pending_arrows = [arrow for arrow in self._pending_arrows
+                                    if id(arrow.start_task) not in gone and id(arrow.end_task) not in gone]
+        if not placed:
+            return
+        placed = list(placed.values())
+        store = self.store
+        neighbours = set()
+        for task in placed:
+            for arrow in list(self._task_arrows.get(task, ())):
+                self._unplace_arrow(arrow)
+                neighbours.update((arrow.start_task, arrow.end_task))
+        for task in placed:
+            i = task._index
+            self.lanes.remove(task, store.row_y[i], float(store.start_x[i]), float(store.end_x[i]))
+            if self._bars is not None:
+                self._bars.remove(task)
+            else:
+                task.remove(self.ax)
+            self.graph.remove_task(task)
+            if self._hover_task is task:
+                self._hover_task = None
+            if self._pressed_task is task:
+                self._pressed_task = None
+        if len(placed) == 1:
+            del self.tasks[placed[0]._index]
+            self.store.remove(placed[0])
+        else:
+            self.store.remove_many(placed)
+            self.tasks[:] = self.store.tasks
+        self._hit_index.invalidate()
+        if neighbours:
+            self._dependencies_changed(task for task in neighbours if task._store is store)
+
+    def add_arrow(self, arrow):
+        if self._batch_depth:
+            self._pending_arrows.append(arrow)
+            return
+        self._place_arrow(arrow)
+        self._update_lod()
+        self._dependencies_changed()
+
+    def _place_arrow(self, arrow):
+        """ Route and create the artists for a dependency arrow
+
+        :param arrow: Arrow to place
+        :return: None
+        """
+        self._register_arrow(arrow)
+        self.graph.add_edge(arrow.start_task, arrow.end_task)
+        arrow.set_viewer(self)
+        with self._phase('place_arrow'):
+            if self._arrow_pool is not None:
+                arrow.route()
+                self._arrow_pool.add(arrow)
+            else:
+                arrow.draw(self.ax, autolim=False)
+        if self._tiles is not None:
+            self._tiles._invalidate_path(arrow.path)
+
+    def route_arrows(self):
+        """ Route every arrow again in one batch, updating the artists of the arrows whose route changed. With
+        the orthogonal router only arrows whose end points or surrounding bars moved are actually re-routed.
+
+        :return: Number of arrows whose route changed
+        """
+        # Arrows are routed as they are added, so only a change to the bars can leave a route out of date
+        if self._routed_version == self.store.version:
+            return 0
+        self._routed_version = self.store.version
+        changed = 0
+        with self._phase('route_arrows'):
+            routes = self.router.route_all(self.arrows) if self.router is not None else None
+            for i, arrow in enumerate(self.arrows):
+                old = arrow.path
+                if routes is None:
+                    if arrow.route() is old:
+                        continue
+                elif routes[i][0] is old:
+                    continue
+                else:
+                    arrow.path, arrow.head = routes[i]
+                changed += 1
+                if self._tiles is not None:
+                    self._tiles._invalidate_path(old)
+                    self._tiles._invalidate_path(arrow.path)
+                self._hit_index.arrow_moved(arrow)
+                if self._arrow_pool is not None:
+                    self._arrow_pool.update(arrow)
+                elif arrow.arrow_patch:
+                    arrow.arrow_patch[0].set_path(arrow.path)
+                    arrow.arrow_patch[1].set_positions(*arrow.head)
+        return changed
+
+    def _restore(self, data, names, groups, lanes, edges, routes, keys=None, boxes=None, gaps=None):
+        """ Take in tasks and routed arrows saved earlier, such as from a snapshot, without parsing dates, laying
+        out lanes or routing arrows
+
+        :param data: Array of shape (6, n) of task columns laid out like GTaskStore's
+        :param names: Sequence of n task names
+        :param groups: Sequence of n swimlane groups, or None
+        :param lanes: Tuple of (row count, bands) as given by GLaneLayout.row_count and bands()
+        :param edges: Array of shape (m, 2) of the store indices of the start and end task of each arrow
+        :param routes: Sequence of m (path, head end points) tuples
+        :param keys: Optional sequence of m path cache keys the routes were made under, so later edits only
+                     re-route the arrows they affect
+        :param boxes: Optional array of shape (m, 4) of the (x0, x1, y0, y1) boxes of the paths
+        :param gaps: Optional sequence of m gaps between bars that legacy routes were made with
+        :return: Tuple of (list of tasks, list of arrows)
+        """
+        if self.render_mode == 'patch':
+            raise ValueError("Restoring needs the 'collection' or 'virtual' render mode")
+        if self.tasks:
+            raise ValueError("Restoring needs an empty viewer")
+        tasks = self.store.extend(data, names, groups)
+        self.tasks.extend(tasks)
+        self.lanes.restore(lanes[0], lanes[1], data[GTaskStore.ROW], data[GTaskStore.START], data[GTaskStore.END])
+        self._bars.extend(tasks)
+        if self.stats is not None:
+            self.stats.count('tasks_drawn', len(tasks))
+
+        if gaps is None:
+            gaps = itertools.repeat(self.layout.gap(tasks[0].row) if tasks else self.layout.bar_height)
+        arrows = []
+        for (start, end), (path, head), gap in zip(edges.tolist(), routes, gaps):
+            arrow = GDependencyArrow(tasks[start], tasks[end])
+            arrow._viewer = self
+            arrow._task_gap = gap
+            arrow.path = path
+            arrow.head = head
+            arrows.append(arrow)
+        for arrow in arrows:
+            self._register_arrow(arrow, index=False)
+        self.graph.add_edges((arrow.start_task, arrow.end_task) for arrow in arrows)
+        if keys is not None:
+            self.path_cache.maxsize = max(self.path_cache.maxsize, 2 * len(arrows))
+            for key, route in zip(keys, routes):
+                self.path_cache.put(key, route)
+        if boxes is None:
+            boxes = np.array([GArrowPool._box(path) for path, _ in routes]).reshape(-1, 4)
+        self._hit_index.extend_arrows(arrows, boxes)
+        if self._arrow_pool is not None:
+            self._arrow_pool.extend(arrows, boxes)
+        else:
+            for arrow in arrows:
+                arrow._add_artists(self.ax, autolim=False)
+        self._routed_version = self.store.version
+        self._hit_index.invalidate()
+        self._update_lod()
+        return tasks, arrows
+
+    def _register_arrow(self, arrow, index=True):
+        """ Add an arrow to the arrow list and to the reverse index of both its tasks
+
+        :param arrow: Arrow to register
+        :param index: Whether to add it to the hit index too, which the caller otherwise does in bulk
+        :return: None
+        """
+        arrow._viewer_index = len(self.arrows)
+        self.arrows.append(arrow)
+        if index:
+            self._hit_index.add_arrow(arrow)
+        for task in (arrow.start_task, arrow.end_task):
+            linked = self._task_arrows.get(task)
+            if linked is None:
+                self._task_arrows[task] = {arrow: None}
+            else:
+                linked[arrow] = None
+
+    def remove_arrow(self, arrow):
+        """ Remove a dependency arrow
+
+        :param arrow: Arrow to remove, arrows not in the viewer are ignored
+        :return: None
+        """
+        if arrow._viewer is self and arrow._viewer_index is not None:
+            self._unplace_arrow(arrow)
+            self._dependencies_changed((arrow.start_task, arrow.end_task))
+        elif arrow in self._pending_arrows:
+            self._pending_arrows.remove(arrow)
+
+    def _unplace_arrow(self, arrow):
+        """ Remove an arrow's artists, its dependency and its registry entries. The last arrow is moved into its
+        slot, as GArrowPool does, so this does not depend on the number of arrows.
+
+        :param arrow: Placed arrow to remove
+        :return: None
+        """
+        if self._arrow_pool is not None:
+            self._arrow_pool.remove(arrow)
+        else:
+            arrow.remove(self.ax)
+        if self._tiles is not None:
+            self._tiles._invalidate_path(arrow.path)
+        i = arrow._viewer_index
+        self._hit_index.remove_arrow(i)
+        moved = self.arrows.pop()
+        if moved is not arrow:
+            self.arrows[i] = moved
+            moved._viewer_index = i
+        arrow._viewer_index = None
+        start_task, end_task = arrow.start_task, arrow.end_task
+        for task in (start_task, end_task):
+            linked = self._task_arrows[task]
+            linked.pop(arrow, None)
+            if not linked:
+                del self._task_arrows[task]
+        # The graph holds one edge per pair of tasks, which stays while another arrow still links them
+        if not any(other.end_task is end_task for other in self._task_arrows.get(start_task, ())):
+            self.graph.remove_edge(start_task, end_task)
+        if self._hover_arrow is arrow:
+            self._hover_arrow = None
+
+    def arrows_of(self, task):
+        """ Arrows to and from a task
+
+        :param task: Task to look up
+        :return: List of arrows
+        """
+        return list(self._task_arrows.get(task, ()))
+
+    def _cull(self, ax=None):
+        """ Materialise only the bars and arrows near the current view. Nothing is done while the view stays inside
+        the window materialised last time, so small pans and zooms cost nothing.
+
+        :param ax: Axes whose limits changed, unused
+        :return: None
+        """
+        (x0, y0), (x1, y1) = self.ax.viewLim.get_points()
+        x0, x1 = min(x0, x1), max(x0, x1)
+        y0, y1 = min(y0, y1), max(y0, y1)
+        dx = (x1 - x0) * GArrowPool.MARGIN
+        dy = (y1 - y0) * GArrowPool.MARGIN
+        if self._window is not None:
+            wx0, wx1, wy0, wy1 = self._window
+            # Keep the window while the view is inside it, unless zooming in has left it far bigger than needed
+            if wx0 <= x0 and x1 <= wx1 and wy0 <= y0 and y1 <= wy1 and \
+                    wx1 - wx0 <= 2 * (x1 - x0 + 2 * dx) and wy1 - wy0 <= 2 * (y1 - y0 + 2 * dy):
+                return
+        self._window = (x0 - dx, x1 + dx, y0 - dy, y1 + dy)
+        self._bars.set_window(self._window)
+        if self._lod is None or self._lod.level != GLevelOfDetail.FAR:
+            self._arrow_pool.set_window(self._window)
+
+    def connect_events(self):
+        """ Connect the single set of mouse handlers that serves every task and arrow in the viewer
+
+        :return: None
+        """
+        canvas = self.fig.canvas
+        self._event_ids = [canvas.mpl_connect('motion_notify_event', self._on_motion),
+                           canvas.mpl_connect('button_press_event', self._on_press),
+                           canvas.mpl_connect('button_release_event', self._on_release)]
+
+    def disconnect_events(self):
+        """ Disconnect the mouse handlers connected by connect_events
+
+        :return: None
+        """
+        for cid in self._event_ids:
+            self.fig.canvas.mpl_disconnect(cid)
+        self._event_ids = []
+
+    def close(self):
+        """ Disconnect every handler the viewer connected to its figure and axes, and close the figure if pyplot
+        manages it, so nothing keeps the viewer alive
+
+        :return: None
+        """
+        self.disconnect_events()
+        self.disable_stats()
+        for cid in self._cull_ids:
+            self.ax.callbacks.disconnect(cid)
+        self._cull_ids = []
+        if self._overlay is not None:
+            self._overlay.disconnect()
+        if self._lod is not None:
+            self._lod.disconnect()
+        if not (self.headless or self.embedded):
+            import matplotlib.pyplot as plt
+            plt.close(self.fig)
+
+    def hit_test(self, event):
+        """ Find the task and arrow under a mouse event
+
+        :param event: Matplotlib mouse event
+        :return: Tuple of (task, arrow), either of which may be None
+        """
+        if event.inaxes is not self.ax or event.xdata is None:
+            return None, None
+        self._hit_index.build(self)
+        task = self._hit_index.find_task(event.xdata, event.ydata)
+        arrow = None
+        # Arrows are hidden when zoomed far out
+        if task is None and (self._lod is None or self._lod.level != GLevelOfDetail.FAR):
+            for candidate in self._hit_index.find_arrows(event.xdata, event.ydata):
+                if candidate.arrow_patch[0].contains(event)[0]:
+                    arrow = candidate
+                    break
+        return task, arrow
+
+    def _on_motion(self, event):
+        if self.stats is not None:
+            self.stats.count('hover_events')
+            with self.stats.phase('hover'):
+                self._hover(event)
+        else:
+            self._hover(event)
+
+    def _hover(self, event):
+        task, arrow = self.hit_test(event)
+        changed = False
+        if task is not self._hover_task:
+            if self._overlay is not None:
+                self._overlay.show_task(task)
+            else:
+                if self._hover_task is not None:
+                    self._hover_task.set_hover(False)
+                if task is not None:
+                    task.set_hover(True)
+            self._hover_task = task
+            changed = True
+        if arrow is not self._hover_arrow:
+            if self._overlay is not None:
+                self._overlay.show_arrow(arrow)
+            else:
+                if self._hover_arrow is not None:
+                    self._hover_arrow.set_hover(False)
+                if arrow is not None:
+                    arrow.set_hover(True)
+            self._hover_arrow = arrow
+            changed = True
+        if changed:
+            self._refresh()
+
+    def _on_press(self, event):
+        task, _ = self.hit_test(event)
+        if task is not None:
+            if self._overlay is not None:
+                self._overlay.show_task(task, GTask.PRESS_COLOURS.get(event.button, 'lightgreen'))
+            else:
+                task.press(event.button)
+            self._pressed_task = task
+            self._refresh()
+
+    def _on_release(self, event):
+        if self._pressed_task is not None:
+            task, _ = self.hit_test(event)
+            if self._overlay is not None:
+                self._overlay.show_task(task)
+            else:
+                self._pressed_task.release(task is self._pressed_task)
+            self._pressed_task = None
+            self._refresh()
+
+    def _refresh(self):
+        """ Show a change in hover or selection, by blitting the overlay if enabled or else redrawing the figure
+
+        :return: None
+        """
+        if self._overlay is None or not self._overlay.blit():
+            if self.stats is not None:
+                self.stats.count('redraw_requests')
+            self.fig.canvas.draw_idle()
+        elif self.stats is not None:
+            self.stats.count('blits')
+
+    def _dates_changed(self, task, old_start, old_end):
+        """ Move the task to another lane if it now overlaps a neighbour on its own, then re-propagate the schedule
+        downstream and upstream of it
+
+        :param task: Task whose dates changed
+        :param old_start: Previous start as a day number
+        :param old_end: Previous end as a day number
+        :return: None
+        """
+        i = task._index
+        store = self.store
+        row = store.row_y[i]
+        new_row = self.lanes.move(task, row, old_start, old_end, float(store.start_x[i]), float(store.end_x[i]))
+        if new_row != row:
+            task.row = new_row
+        changed = self.graph.task_changed(task)
+        if self._highlight_critical is not None and changed:
+            self._apply_critical_highlight(changed)
+
+    def highlight_critical_path(self, facecolor='salmon', arrow_colour='crimson'):
+        """ Colour the tasks with no slack and the dependency arrows between them. The highlight follows later
+        date changes.
+
+        :param facecolor: Colour of critical task bars
+        :param arrow_colour: Colour of critical dependency arrows
+        :return: List of the critical tasks in topological order
+        """
+        self._highlight_critical = (facecolor, arrow_colour)
+        self.graph.refresh()
+        self._apply_critical_highlight(self.graph.successors)
+        return self.graph.critical_path()
+
+    def clear_critical_path(self):
+        """ Remove the critical path highlight
+
+        :return: None
+        """
+        self._highlight_critical = None
+        if self._tiles is not None:
+            self._tiles.invalidate()
+        if self._lod is not None:
+            self._lod.invalidate()
+        for task in self.graph.tasks:
+            task.facecolor = 'skyblue'
+            task.set_style(facecolor=task.facecolor)
+        for arrow in self.arrows:
+            arrow.set_colour('gray')
+
+    def _dependencies_changed(self, tasks=()):
+        """ Work out the critical path again after dependencies were added or removed, if it is highlighted
+
+        :param tasks: Tasks that may have lost their last dependency, whose highlight has to be cleared too
+        :return: None
+        """
+        if self._highlight_critical is None:
+            return
+        changed = self.graph.refresh()
+        self._apply_critical_highlight(itertools.chain(self.graph.successors if changed is None else changed, tasks))
+
+    def _apply_critical_highlight(self, tasks):
+        """ Restyle the given tasks, and the arrows to and from them, by whether they are critical. Only the tasks
+        and arrows whose colour changes are touched.
+
+        :param tasks: Tasks to restyle
+        :return: None
+        """
+        facecolor, arrow_colour = self._highlight_critical
+        if self._lod is not None:
+            self._lod.invalidate()
+        tiles = self._tiles
+        arrows = {}
+        for task in tasks:
+            arrows.update(self._task_arrows.get(task, ()))
+            colour = facecolor if self.graph.is_critical(task) else 'skyblue'
+            if colour == task.facecolor:
+                continue
+            if tiles is not None:
+                tiles.invalidate(mdates.date2num(task.start), mdates.date2num(task.end))
+            task.facecolor = colour
+            task.set_style(facecolor=colour)
+        for arrow in arrows:
+            critical = self.graph.is_critical_edge(arrow.start_task, arrow.end_task)
+            colour = arrow_colour if critical else 'gray'
+            if colour == arrow.colour:
+                continue
+            if tiles is not None:
+                tiles._invalidate_path(arrow.path)
+            arrow.set_colour(colour)
+
+    def add_scrollbar(self, scrollbar):
+        self.scrollbars.append(scrollbar)
+        scrollbar.link(self)
+
+    def remove_scrollbar(self, scrollbar):
+        if scrollbar in self.scrollbars:
+            scrollbar.unlink(self)
+            self.scrollbars.remove(scrollbar)
+
+    def _fit_view(self):
+        """ Pack again if edits left the layout stale, re-route the arrows whose surroundings changed, then set the
+        axis limits to fit all tasks
+
+        :return: None
+        """
+        if self.lanes.stale:
+            self.relayout()
+        self.route_arrows()
+        if self.tasks:
+            self.ax.set_xlim(self.store.start_x.min() - 1, self.store.end_x.max() + 1)
+            self.ax.set_ylim(-0.5, self.lanes.row_count - 0.5)
+        self._draw_bands()
+
+    def _draw_bands(self):
+        """ Label the swimlanes and separate them with lines
+
+        :return: None
+        """
+        for artist in self._band_artists:
+            artist.remove()
+        self._band_artists = []
+        if self.lanes.mode != 'swimlane':
+            return
+        bands = self.lanes.bands()
+        self.ax.set_yticks([first + (count - 1) / 2 for _, first, count in bands])
+        self.ax.set_yticklabels([str(group) for group, _, _ in bands])
+        for _, first, _ in bands[1:]:
+            self._band_artists.append(self.ax.axhline(first - 0.5, color='lightgray', linewidth=0.8))
+
+    def show(self):
+        if self.headless:
+            raise RuntimeError('A headless viewer cannot be shown, use save() instead')
+        if self.embedded:
+            raise RuntimeError('An embedded viewer is shown by the canvas it is embedded in')
+        import matplotlib.pyplot as plt
+        self._fit_view()
+        self.fig.tight_layout()
+        self._update_lod()
+        plt.show()
+
+
+    def draw(self):
+        """Call the draw function of the plot
+
+        :return: None
+        """
+        with self._phase('fit_view'):
+            self._fit_view()
+        with self._phase('tight_layout'):
+            self.fig.tight_layout()
+        self._update_lod()
+        if self.stats is not None:
+            self.stats.count('redraw_requests')
+            self._update_stats_text()
+        self.fig.canvas.draw_idle()
+
+    def save(self, fname, format=None, dpi=None):
+        """ Render the whole chart to a file
+
+        :param fname: Path or file-like object to write to
+        :param format: 'png', 'svg', 'pdf' or any other format matplotlib supports, from the file name if not given
+        :param dpi: Resolution for raster formats, the figure's own if not given
+        :return: None
+        """
+        with self._phase('fit_view'):
+            self._fit_view()
+        with self._phase('tight_layout'):
+            self.fig.tight_layout()
+        self._update_lod()
+        if self.stats is not None:
+            self._update_stats_text()
+        with self._phase('save'):
+            self.fig.savefig(fname, format=format, dpi=dpi)
+
+    def _phase(self, name):
+        """ Context manager timing a phase if stats are on, doing nothing otherwise
+
+        :param name: Name of the phase
+        :return: Context manager
+        """
+        return self.stats.phase(name) if self.stats is not None else _NO_PHASE
+
+    def _update_lod(self):
+        """ Bring the level of detail up to date after tasks or arrows were added or the axes were laid out
+
+        :return: None
+        """
+        if self._lod is not None:
+            self._lod.update()
+
+    def enable_stats(self, stats=None):
+        """ Start collecting per-phase timings and counts of tasks drawn, arrows routed, clash checks, redraws and
+        hover events. Tasks built outside the viewer have their dates parsed before it sees them, so 'parse' only
+        covers DataFrames handed to add_tasks and schedule files streamed in by GScheduleLoader.
+
+        :param stats: GStats to collect into, a new one if not given
+        :return: The GStats
+        """
+        self.disable_stats()
+        self.stats = stats if stats is not None else GStats()
+        self.obstacles.stats = self.stats
+        if self.router is not None:
+            self.router.stats = self.stats
+        self._stats_mark = self.fig.add_artist(_GRenderMark(self.stats))
+        self._stats_ids = [self.fig.canvas.mpl_connect('draw_event', self._stats_drawn)]
+        return self.stats
+
+    def disable_stats(self):
+        """ Stop collecting timings and counts, hiding the stats overlay
+
+        :return: The GStats collected into, or None if stats were off
+        """
+        if self.stats is None:
+            return None
+        self.show_stats(False)
+        stats, self.stats = self.stats, None
+        self.obstacles.stats = None
+        if self.router is not None:
+            self.router.stats = None
+        for cid in self._stats_ids:
+            self.fig.canvas.mpl_disconnect(cid)
+        self._stats_ids = []
+        self._stats_mark.remove()
+        self._stats_mark = None
+        return stats
+
+    def show_stats(self, visible=True):
+        """ Show or hide the stats report in the corner of the figure, refreshed on each draw. Turns stats on if
+        they are off.
+
+        :param visible: Whether to show the report
+        :return: None
+        """
+        if not visible:
+            if self._stats_text is not None:
+                self._stats_text.remove()
+                self._stats_text = None
+            return
+        if self.stats is None:
+            self.enable_stats()
+        if self._stats_text is None:
+            self._stats_text = self.fig.text(0.01, 0.99, '', fontsize=6, family='monospace', va='top',
+                                             bbox={'facecolor': 'white', 'alpha': 0.8, 'edgecolor': 'none'})
+        self._update_stats_text()
+
+    def _update_stats_text(self):
+        if self._stats_text is not None:
+            self._stats_text.set_text(self.stats.report())
+
+    def _stats_drawn(self, event):
+        """ Count a finished render of the figure, timing it from when the render mark was drawn """
+        stats = self.stats
+        stats.count('redraws')
+        if stats._render_start is not None:
+            stats.record('render', time.perf_counter() - stats._render_start)
+            stats._render_start = None
+
+class GScrollBar:
+    def __init__(self, orientation='horizontal'):
+        self.orientation = orientation
+        self.slider = None
+
+    def link(self, viewer):
+        from matplotlib.widgets import Slider
+        axcolor = 'lightgoldenrodyellow'
+        if self.orientation == 'horizontal':
+            ax_hscroll = viewer.fig.add_axes([0.1, 0.05, 0.65, 0.03], facecolor=axcolor)
+            self.slider = Slider(ax_hscroll, 'Scroll X', mdates.date2num(viewer.tasks[0].start - timedelta(days=1)),
+                                 mdates.date2num(viewer.tasks[-1].end + timedelta(days=1)),
+                                 valinit=mdates.date2num(viewer.tasks[0].start - timedelta(days=1)))
+            self.slider.on_changed(lambda val: self.update(val, viewer))
+        elif self.orientation == 'vertical':
+            ax_vscroll = viewer.fig.add_axes([0.85, 0.1, 0.03, 0.65], facecolor=axcolor)
+            self.slider = Slider(ax_vscroll, 'Scroll Y', 0, viewer.lanes.row_count-1, valinit=0, valstep=1, orientation='vertical')
+            self.slider.on_changed(lambda val: self.update(val, viewer))
+        if viewer._overlay is not None:
+            # The slider handle is blitted straight away in update, the chart follows with a coalesced redraw
+            self.slider.drawon = False
+
+    def unlink(self, viewer):
+        if self.slider:
+            self.slider.disconnect_events()
+            self.slider = None
+
+    def update(self, val, viewer):
+        if self.orientation == 'horizontal':
+            if viewer._tiles is not None and viewer._tiles.scroll_to(val, 10):
+                viewer._overlay.blit_axes(self.slider.ax)
+                return
+            x_offset = mdates.num2date(val)
+            viewer.ax.set_xlim(x_offset, x_offset + timedelta(days=10))
+        elif self.orientation == 'vertical':
+            y_offset = int(val)
+            viewer.ax.set_ylim(y_offset - 0.5, y_offset + viewer.lanes.row_count - 0.5)
+        if viewer._overlay is not None:
+            viewer._overlay.blit_axes(self.slider.ax)
+        viewer.fig.canvas.draw_idle()
+
+class GRowLayout:
+    """ Model of the rows occupied by task bars, kept up to date as tasks are added, moved and removed so that
+    row pitch and the gap between bars can be looked up without scanning the tasks
+    """
+
+    def __init__(self, bar_height=0.5):
+        """ Row layout model
+
+        :param bar_height: Height of a task bar in data units
+        """
+        self.bar_height = bar_height
+        self._counts = {}
+        self._rows = []  # Sorted distinct occupied rows
+        self._pitch = None
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(self, row):
+        """ Register a bar on a row
+
+        :param row: Row of the bar
+        :return: None
+        """
+        if row in self._counts:
+            self._counts[row] += 1
+            return
+        self._counts[row] = 1
+        bisect.insort(self._rows, row)
+        self._pitch = None
+
+    def extend(self, rows):
+        """ Register many bars at once
+
+        :param rows: Array of the rows of the bars
+        :return: None
+        """
+        values, counts = np.unique(rows, return_counts=True)
+        for row, count in zip(values.tolist(), counts.tolist()):
+            self._counts[row] = self._counts.get(row, 0) + count
+        self._rows = sorted(self._counts)
+        self._pitch = None
+
+    def remove(self, row):
+        """ Unregister a bar from a row
+
+        :param row: Row of the bar
+        :return: None
+        """
+        self._counts[row] -= 1
+        if self._counts[row] == 0:
+            del self._counts[row]
+            del self._rows[bisect.bisect_left(self._rows, row)]
+            self._pitch = None
+
+    def move(self, old_row, new_row):
+        """ Move a bar from one row to another
+
+        :param old_row: Previous row of the bar
+        :param new_row: New row of the bar
+        :return: None
+        """
+        if old_row != new_row:
+            self.remove(old_row)
+            self.add(new_row)
+
+    @property
+    def pitch(self):
+        """ Smallest distance between two occupied rows, or 1 if fewer than two rows are occupied """
+        if self._pitch is None:
+            self._pitch = float(np.diff(self._rows).min()) if len(self._rows) > 1 else 1.0
+        return self._pitch
+
+    def gap(self, row):
+        """ Smallest vertical gap between the bars on a row and any other bar edge, the bar height included
+
+        :param row: Reference row
+        :return: Gap in data units
+        """
+        gap = self.bar_height
+        i = bisect.bisect_left(self._rows, row)
+        # Only the nearest occupied rows either side can give the smallest gap
+        for j in (i - 1, i + 1 if i < len(self._rows) and self._rows[i] == row else i):
+            if 0 <= j < len(self._rows):
+                gap = min(gap, abs(abs(row - self._rows[j]) - self.bar_height))
+        return gap
+
+
+class GLaneLayout:
+    """ Layout engine that gives each task its row. 'row' puts every task on a row of its own, 'packed' lets tasks
+    that do not overlap in time share a row, and 'swimlane' packs each group of tasks into its own band of rows.
+    Batches are packed by greedy interval partitioning: tasks are taken in start order and go on the lane that frees
+    up first, found with a heap, which uses the fewest rows possible in O(N log N). A single task added later goes in
+    the tightest gap it fits on any lane. Either way the layout is marked stale once the lanes outnumber the most
+    tasks overlapping at any time, which is what packing from scratch would use.
+    """
+    MODES = ('row', 'packed', 'swimlane')
+
+    def __init__(self, mode='row', group_key=None, spacing=0.5):
+        """ Lane layout engine
+
+        :param mode: 'row', 'packed' or 'swimlane'
+        :param group_key: Function giving the swimlane of a task, the task's group if not given
+        :param spacing: Minimum gap in days between tasks sharing a row, so their rounded bars do not touch
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown lane mode '{mode}'")
+        self.mode = mode
+        self.group_key = group_key if group_key is not None else (lambda task: task.group)
+        self.spacing = spacing
+        self.stale = False  # Set when the rows handed out no longer make a valid or compact layout
+        self.reset()
+
+    def reset(self):
+        """ Forget every row handed out
+
+        :return: None
+        """
+        self._next_row = 0
+        self._free = []  # Rows freed in 'row' mode, in order
+        self._lanes = {}  # Per group, list of lanes, each a pair of lists of the starts and ends on it in order
+        self._groups = []  # Groups in the order their bands are stacked
+        self._offsets = {}
+        self.stale = False
+
+    @property
+    def row_count(self):
+        """ Number of rows in use """
+        if self.mode == 'row':
+            return self._next_row
+        return sum(len(lanes) for lanes in self._lanes.values())
+
+    def bands(self):
+        """ Rows used by each swimlane
+
+        :return: List of (group, first row, number of rows) in stacking order
+        """
+        return [(group, self._offsets[group], len(self._lanes[group])) for group in self._groups]
+
+    def _group(self, task):
+        return self.group_key(task) if self.mode == 'swimlane' else None
+
+    def _add_group(self, group):
+        """ Lanes of a group, stacking a new band below the others for a group not seen before """
+        if group not in self._lanes:
+            self._offsets[group] = self.row_count
+            self._lanes[group] = []
+            self._groups.append(group)
+        return self._lanes[group]
+
+    def _open_lane(self, group):
+        """ Add a lane to a group
+
+        :param group: Group to grow
+        :return: Index of the new lane within the group
+        """
+        lanes = self._lanes[group]
+        lanes.append(([], []))
+        if group != self._groups[-1]:
+            # The band has grown into the rows of the next one, which have to move down
+            self.stale = True
+        return len(lanes) - 1
+
+    @staticmethod
+    def _put(lane, start, end):
+        starts, ends = lane
+        i = bisect.bisect_right(starts, start)
+        starts.insert(i, start)
+        ends.insert(i, end)
+
+    def _slack(self, lane, start, end):
+        """ Free time on a lane before a task, or None if the task does not fit on the lane
+
+        :param lane: Pair of lists of the starts and ends on the lane
+        :param start: Start of the task as a day number
+        :param end: End of the task as a day number
+        :return: Days between the task before and this one, inf if there is none, or None
+        """
+        starts, ends = lane
+        i = bisect.bisect_right(starts, start)
+        if i < len(starts) and starts[i] < end + self.spacing:
+            return None
+        if i == 0:
+            return math.inf
+        slack = start - ends[i - 1] - self.spacing
+        return slack if slack >= 0 else None
+
+    def _needed(self, group):
+        """ Fewest lanes the tasks of a group fit on, which is the most of them overlapping at any time """
+        lanes = self._lanes[group]
+        starts = np.array([start for lane_starts, _ in lanes for start in lane_starts])
+        ends = np.array([end for _, lane_ends in lanes for end in lane_ends]) + self.spacing
+        steps = np.concatenate((np.ones(len(starts)), -np.ones(len(ends))))
+        # A lane that frees up just as a task starts can take it, so ends are counted first
+        order = np.lexsort((steps, np.concatenate((starts, ends))))
+        return int(np.cumsum(steps[order]).max()) if len(order) else 0
+
+    def _assign(self, start, end, group):
+        """ Hand out the row for one task
+
+        :param start: Start of the task as a day number
+        :param end: End of the task as a day number
+        :param group: Swimlane of the task, None outside swimlane mode
+        :return: Row
+        """
+        if self.mode == 'row':
+            if self._free:
+                return self._free.pop(0)
+            row = self._next_row
+            self._next_row += 1
+            return row
+        return self._fit(start, end, group)
+
+    def _fit(self, start, end, group):
+        """ Put a task in the tightest gap it fits on any lane of its group, opening a lane if there is none
+
+        :param start: Start of the task as a day number
+        :param end: End of the task as a day number
+        :param group: Swimlane of the task, None outside swimlane mode
+        :return: Row
+        """
+        lanes = self._add_group(group)
+        best = lane = None
+        for i, candidate in enumerate(lanes):
+            slack = self._slack(candidate, start, end)
+            if slack is not None and (best is None or slack < best):
+                best, lane = slack, i
+        if lane is None:
+            lane = self._open_lane(group)
+            self._put(lanes[lane], start, end)
+            if len(lanes) > self._needed(group):
+                self.stale = True
+        else:
+            self._put(lanes[lane], start, end)
+        return self._offsets[group] + lane
+
+    def _pack(self, groups, starts, ends):
+        """ Greedy interval partitioning of a batch of tasks onto the lanes of their groups
+
+        :param groups: Group of each task
+        :param starts: Starts of the tasks as day numbers
+        :param ends: Ends of the tasks as day numbers
+        :return: Tuple of (list of lanes in the order of the tasks, set of groups given new lanes)
+        """
+        lanes = [0] * len(groups)
+        heaps = {}  # Per group, heap of (end of last task, lane)
+        opened = set()
+        for i in np.argsort(starts, kind='stable').tolist():
+            start, end, group = float(starts[i]), float(ends[i]), groups[i]
+            heap = heaps.get(group)
+            if heap is None:
+                heap = heaps[group] = [(lane_ends[-1] if lane_ends else -math.inf, lane)
+                                       for lane, (_, lane_ends) in enumerate(self._add_group(group))]
+                heapq.heapify(heap)
+            if heap and heap[0][0] + self.spacing <= start:
+                # The lane that frees up first is free before this task starts
+                lane = heapq.heappop(heap)[1]
+            else:
+                lane = self._open_lane(group)
+                opened.add(group)
+            heapq.heappush(heap, (end, lane))
+            self._put(self._lanes[group][lane], start, end)
+            lanes[i] = lane
+        return lanes, opened
+
+    def assign(self, tasks, starts, ends):
+        """ Hand out rows for a batch of tasks, taking them in start order so packing is optimal for the batch
+
+        :param tasks: Tasks to place
+        :param starts: Starts of the tasks as day numbers
+        :param ends: Ends of the tasks as day numbers
+        :return: List of rows in the order of the tasks
+        """
+        if self.mode == 'row' or len(tasks) == 1:
+            return [self._assign(float(start), float(end), self._group(task))
+                    for task, start, end in zip(tasks, starts, ends)]
+        groups = [self._group(task) for task in tasks]
+        lanes, opened = self._pack(groups, starts, ends)
+        if any(len(self._lanes[group]) > self._needed(group) for group in opened):
+            self.stale = True
+        return [self._offsets[group] + lane for group, lane in zip(groups, lanes)]
+
+    def layout(self, tasks, starts, ends):
+        """ Work out the rows of every task from scratch
+
+        :param tasks: All the tasks
+        :param starts: Starts of the tasks as day numbers
+        :param ends: Ends of the tasks as day numbers
+        :return: List of rows in the order of the tasks
+        """
+        self.reset()
+        if self.mode == 'row':
+            return self.assign(tasks, starts, ends)
+        groups = [self._group(task) for task in tasks]
+        # Stack the bands in order of first appearance, and only work out where they start once all are packed
+        for group in groups:
+            self._add_group(group)
+        lanes, _ = self._pack(groups, starts, ends)
+        offset = 0
+        for group in self._groups:
+            self._offsets[group] = offset
+            offset += len(self._lanes[group])
+        self.stale = False
+        return [self._offsets[group] + lane for group, lane in zip(groups, lanes)]
+
+    def move(self, task, row, old_start, old_end, start, end):
+        """ Follow a change to the dates of a task, which keeps its lane unless it now overlaps a neighbour there. It
+        then goes in the tightest gap it fits on another lane, so other tasks do not move.
+
+        :param task: Task whose dates changed
+        :param row: Row of the task
+        :param old_start: Previous start as a day number
+        :param old_end: Previous end as a day number
+        :param start: New start as a day number
+        :param end: New end as a day number
+        :return: Row the task should now be on
+        """
+        if self.mode == 'row':
+            return row
+        group = self._group(task)
+        lane = self._take(group, row, old_start, old_end)
+        if lane is None:
+            return row
+        if self._slack(lane, start, end) is None:
+            return self._fit(start, end, group)
+        self._put(lane, start, end)
+        return row
+
+    def remove(self, task, row, start, end):
+        """ Free the row or the place on its lane of a task being removed. Freed rows are handed out again before
+        new ones, and empty lanes at the bottom are dropped.
+
+        :param task: Task being removed
+        :param row: Row of the task
+        :param start: Start of the task as a day number
+        :param end: End of the task as a day number
+        :return: None
+        """
+        row = int(row)
+        if self.mode == 'row':
+            if row == self._next_row - 1:
+                self._next_row -= 1
+                while self._free and self._free[-1] == self._next_row - 1:
+                    self._next_row = self._free.pop()
+            else:
+                bisect.insort(self._free, row)
+            return
+        group = self._group(task)
+        if self._take(group, row, start, end) is None or group != self._groups[-1]:
+            return
+        lanes = self._lanes[group]
+        while lanes and not lanes[-1][0]:
+            lanes.pop()
+        if not lanes:
+            del self._lanes[group], self._offsets[group]
+            self._groups.pop()
+
+    def _take(self, group, row, start, end):
+        """ Take a task off its lane
+
+        :param group: Swimlane of the task, None outside swimlane mode
+        :param row: Row of the task
+        :param start: Start of the task as a day number
+        :param end: End of the task as a day number
+        :return: The lane, or None if the task was not found on it
+        """
+        lanes = self._lanes.get(group, ())
+        lane = int(row) - self._offsets.get(group, 0)
+        if 0 <= lane < len(lanes):
+            starts, ends = lanes[lane]
+            i = bisect.bisect_left(starts, start)
+            if i < len(starts) and starts[i] == start and ends[i] == end:
+                del starts[i], ends[i]
+                return lanes[lane]
+        # The task is not where it was put, such as after being moved to another row by hand
+        self.stale = True
+        return None
+
+    def restore(self, row_count, bands, rows, starts, ends):
+        """ Take over rows handed out earlier, such as those of a loaded snapshot, without laying out again
+
+        :param row_count: Number of rows in use
+        :param bands: List of (group, first row, number of rows) in stacking order, as given by bands()
+        :param rows: Rows of the tasks
+        :param starts: Starts of the tasks as day numbers
+        :param ends: Ends of the tasks as day numbers
+        :return: None
+        """
+        self.reset()
+        if self.mode == 'row':
+            self._next_row = row_count
+            used = np.zeros(row_count, dtype=bool)
+            used[np.asarray(rows, dtype=int)] = True
+            self._free = np.flatnonzero(~used).tolist()
+            return
+        lanes = [([], []) for _ in range(row_count)]
+        order = np.lexsort((starts, rows))
+        for row, start, end in zip(np.asarray(rows)[order].astype(int).tolist(), np.asarray(starts)[order].tolist(),
+                                   np.asarray(ends)[order].tolist()):
+            lanes[row][0].append(start)
+            lanes[row][1].append(end)
+        for group, first, count in bands:
+            self._lanes[group] = lanes[first:first + count]
+            self._offsets[group] = first
+            self._groups.append(group)
+
+
+class GTaskStore:
+    """ Struct-of-arrays table holding the viewer's tasks: dates as float day numbers, row and bar edges, progress
+    and interned names, all in contiguous NumPy arrays in the same order as the viewer's tasks. A task added to the
+    store keeps no data of its own and becomes a lightweight view onto its column.
+    """
+    BAR_HEIGHT = 0.5
+    START, END, ROW, TOP, BOTTOM, PROGRESS = range(6)
+
+    def __init__(self, layout=None):
+        """ Task store
+
+        :param layout: Row layout model to keep informed of row changes
+        """
+        self.layout = layout
+        self.on_dates_changed = None  # Called with the task and its old start and end whenever they change
+        self.tasks = []
+        self.names = []
+        self.version = 0  # Bumped on every geometry change so dependent indexes know when to rebuild
+        self._row_sort_version = -1
+        self._row_sort = None
+        self._size = 0
+        self._data = np.zeros((6, 16))
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def start_x(self):
+        return self._data[self.START, :self._size]
+
+    @property
+    def end_x(self):
+        return self._data[self.END, :self._size]
+
+    @property
+    def row_y(self):
+        return self._data[self.ROW, :self._size]
+
+    @property
+    def top(self):
+        return self._data[self.TOP, :self._size]
+
+    @property
+    def bottom(self):
+        return self._data[self.BOTTOM, :self._size]
+
+    @property
+    def progress(self):
+        return self._data[self.PROGRESS, :self._size]
+
+    @property
+    def nbytes(self):
+        """ Memory used by the store's arrays and name list, excluding the name strings themselves """
+        return self._data[:, :self._size].nbytes + sys.getsizeof(self.tasks) + sys.getsizeof(self.names)
+
+    def add(self, task):
+        """ Append a task to the store, moving its data into the arrays
+
+        :param task: Task to add, which must already have a row
+        :return: None
+        """
+        if self._size == self._data.shape[1]:
+            grown = np.zeros((6, 2 * self._data.shape[1]))
+            grown[:, :self._size] = self._data[:, :self._size]
+            self._data = grown
+        i = self._size
+        row = task._row
+        self._data[:, i] = (mdates.date2num(task._start), mdates.date2num(task._end), row,
+                            row + self.BAR_HEIGHT / 2, row - self.BAR_HEIGHT / 2, task._progress)
+        self.names.append(sys.intern(task._name))
+        self.tasks.append(task)
+        if self.layout is not None:
+            self.layout.add(row)
+        task._store = self
+        task._index = i
+        task._name = task._start = task._end = task._row = task._progress = None
+        self._size += 1
+        self.version += 1
+
+    def extend(self, data, names, groups=None):
+        """ Append many tasks straight from columns, such as those of a loaded snapshot, creating the tasks as views
+        onto their columns
+
+        :param data: Array of shape (6, n) laid out like the store's own columns
+        :param names: Sequence of n task names
+        :param groups: Optional sequence of n swimlane groups
+        :return: List of the new tasks
+        """
+        first = self._size
+        size = first + data.shape[1]
+        if size > self._data.shape[1]:
+            grown = np.zeros((6, max(size, 2 * self._data.shape[1])))
+            grown[:, :first] = self._data[:, :first]
+            self._data = grown
+        self._data[:, first:size] = data
+        self.names.extend(map(sys.intern, names))
+        if groups is None:
+            groups = [None] * data.shape[1]
+        tasks = [GTask._view(self, i, group) for i, group in zip(range(first, size), groups)]
+        self.tasks.extend(tasks)
+        if self.layout is not None:
+            self.layout.extend(data[self.ROW])
+        self._size = size
+        self.version += 1
+        return tasks
+
+    def remove(self, task):
+        """ Remove a task from the store, handing its data back to it and keeping the remaining tasks in order, since
+        table rows and legacy routing go by position
+
+        :param task: Task to remove
+        :return: None
+        """
+        i = task._index
+        self._detach(task)
+        self._data[:, i:self._size - 1] = self._data[:, i + 1:self._size]
+        del self.tasks[i]
+        del self.names[i]
+        for j in range(i, len(self.tasks)):
+            self.tasks[j]._index = j
+        self._size -= 1
+        self.version += 1
+
+    def remove_many(self, tasks):
+        """ Remove many tasks, closing all the gaps in one pass and keeping the remaining tasks in order
+
+        :param tasks: Tasks to remove
+        :return: None
+        """
+        keep = np.ones(self._size, dtype=bool)
+        for task in tasks:
+            keep[task._index] = False
+            self._detach(task)
+        first = int(np.argmin(keep)) if not keep.all() else self._size
+        size = int(keep.sum())
+        self._data[:, first:size] = self._data[:, first:self._size][:, keep[first:]]
+        self.tasks[first:] = [task for task, kept in zip(self.tasks[first:], keep[first:].tolist()) if kept]
+        self.names[first:] = [name for name, kept in zip(self.names[first:], keep[first:].tolist()) if kept]
+        for j in range(first, size):
+            self.tasks[j]._index = j
+        self._size = size
+        self.version += 1
+
+    def _detach(self, task):
+        """ Hand a task its data back from the store, leaving the store's columns to the caller """
+        start, end, row, _, _, progress = self._data[:, task._index].tolist()
+        task._name = self.names[task._index]
+        task._start = _num_to_timestamp(start)
+        task._end = _num_to_timestamp(end)
+        task._row = row
+        task._progress = progress
+        task._store = None
+        task._index = None
+        if self.layout is not None:
+            self.layout.remove(row)
+
+    def update(self, i, start=None, end=None, row=None, progress=None):
+        """ Change some of the values of a task
+
+        :param i: Index of the task in the store
+        :param start: New start as a day number
+        :param end: New end as a day number
+        :param row: New row
+        :param progress: New progress fraction
+        :return: None
+        """
+        data = self._data
+        old_start, old_end = float(data[self.START, i]), float(data[self.END, i])
+        if start is not None:
+            data[self.START, i] = start
+        if end is not None:
+            data[self.END, i] = end
+        if row is not None:
+            if self.layout is not None:
+                self.layout.move(data[self.ROW, i], row)
+            data[self.ROW, i] = row
+            data[self.TOP, i] = row + self.BAR_HEIGHT / 2
+            data[self.BOTTOM, i] = row - self.BAR_HEIGHT / 2
+        if progress is not None:
+            data[self.PROGRESS, i] = progress
+        if start is not None or end is not None or row is not None:
+            self.version += 1
+        if (start is not None or end is not None) and self.on_dates_changed is not None:
+            self.on_dates_changed(self.tasks[i], old_start, old_end)
+
+    def _row_sorted(self):
+        """ Task indices sorted by row, cached until the geometry next changes
+
+        :return: Tuple of (sorted indices, sorted row positions)
+        """
+        if self._row_sort_version != self.version:
+            order = np.argsort(self.row_y, kind='stable')
+            self._row_sort = (order, self.row_y[order])
+            self._row_sort_version = self.version
+        return self._row_sort
+
+    def crossing(self, x, y0, y1):
+        """ Find the bars that a vertical line passes straight through
+
+        :param x: X position of the vertical line
+        :param y0: Y position of one end of the line
+        :param y1: Y position of the other end of the line
+        :return: Sorted array of task indices
+        """
+        lo, hi = min(y0, y1), max(y0, y1)
+        half = self.BAR_HEIGHT / 2
+        order, rows = self._row_sorted()
+        # Only bars whose row lies strictly inside the span can be crossed, so narrow down with a binary search
+        candidates = order[np.searchsorted(rows, lo + half, side='right'):np.searchsorted(rows, hi - half, side='left')]
+        mask = (self.start_x[candidates] < x) & (x < self.end_x[candidates]) & \
+               (self.bottom[candidates] > lo) & (hi > self.top[candidates])
+        return np.sort(candidates[mask])
+
+    def positions(self, i):
+        """ Positions of the middle of each side of a task bar
+
+        :param i: Index of the task in the store
+        :return: Dictionary of (x, y) tuples keyed by 'start', 'end', 'top' and 'bottom'
+        """
+        x_start, x_end, row, top, bottom, _ = self._data[:, i].tolist()
+        return {
+            'start': (x_start, row),
+            'end': (x_end, row),
+            'top': ((x_start + x_end) / 2, top),
+            'bottom': ((x_start + x_end) / 2, bottom)
+        }
+
+
+class GDependencyGraph:
+    """ Task to task dependency edges held as adjacency sets, with a critical path schedule over them. Earliest
+    starts are the later of a task's own start and the earliest finish of its predecessors; latest finishes count
+    back from the project finish. Both passes run in linear time; date changes and removed dependencies
+    re-propagate incrementally.
+    """
+    TOLERANCE = 1e-9
+
+    def __init__(self, store):
+        """ Dependency graph
+
+        :param store: Task store that holds the dates of the tasks
+        """
+        self.store = store
+        self.successors = {}
+        self.predecessors = {}
+        self.earliest_start = {}
+        self.earliest_finish = {}
+        self.latest_start = {}
+        self.latest_finish = {}
+        self.project_finish = None
+        self._order = None
+        self._position = {}
+        self._pruned = False  # Whether tasks left the graph since the order was worked out
+        self._computed = False
+        self._loosened = set()  # Tasks that lost a predecessor since the schedule was computed
+        self._freed = set()  # Tasks that lost a successor since the schedule was computed
+
+    @property
+    def tasks(self):
+        return list(self.successors)
+
+    def _add_node(self, task):
+        if task not in self.successors:
+            self.successors[task] = set()
+            self.predecessors[task] = set()
+
+    def add_edge(self, start_task, end_task):
+        """ Add a dependency of end_task on start_task
+
+        :param start_task: Task that must finish first
+        :param end_task: Task that depends on it
+        :return: None
+        """
+        self._add_node(start_task)
+        self._add_node(end_task)
+        self.successors[start_task].add(end_task)
+        self.predecessors[end_task].add(start_task)
+        self._order = None
+        self._computed = False
+
+    def add_edges(self, edges):
+        """ Add many dependencies at once
+
+        :param edges: Iterable of (start_task, end_task) pairs
+        :return: None
+        """
+        successors = self.successors
+        predecessors = self.predecessors
+        for start_task, end_task in edges:
+            if start_task not in successors:
+                successors[start_task] = set()
+                predecessors[start_task] = set()
+            if end_task not in successors:
+                successors[end_task] = set()
+                predecessors[end_task] = set()
+            successors[start_task].add(end_task)
+            predecessors[end_task].add(start_task)
+        self._order = None
+        self._computed = False
+
+    def remove_edge(self, start_task, end_task):
+        """ Remove a dependency, dropping tasks that are left without any
+
+        :param start_task: Task that must finish first
+        :param end_task: Task that depends on it
+        :return: None
+        """
+        self.successors[start_task].discard(end_task)
+        self.predecessors[end_task].discard(start_task)
+        # Removing a dependency keeps the topological order valid, so the schedule is only re-propagated from the
+        # two ends by refresh
+        self._freed.add(start_task)
+        self._loosened.add(end_task)
+        for task in (start_task, end_task):
+            if not self.successors[task] and not self.predecessors[task]:
+                del self.successors[task]
+                del self.predecessors[task]
+                for values in (self.earliest_start, self.earliest_finish, self.latest_start, self.latest_finish):
+                    values.pop(task, None)
+                self._position.pop(task, None)
+                self._pruned = True
+
+    def remove_task(self, task):
+        """ Remove a task and every dependency to or from it
+
+        :param task: Task to remove
+        :return: None
+        """
+        if task not in self.successors:
+            return
+        for succ in list(self.successors[task]):
+            self.remove_edge(task, succ)
+        for pred in list(self.predecessors.get(task, ())):
+            self.remove_edge(pred, task)
+
+    def topological_order(self):
+        """ Order the tasks so every task comes after all its predecessors (Kahn's algorithm)
+
+        :return: List of tasks
+        """
+        if self._order is not None and self._pruned:
+            self._order = [task for task in self._order if task in self.successors]
+            self._pruned = False
+        if self._order is None:
+            in_degree = {task: len(preds) for task, preds in self.predecessors.items()}
+            ready = [task for task, degree in in_degree.items() if degree == 0]
+            order = []
+            while ready:
+                task = ready.pop()
+                order.append(task)
+                for succ in self.successors[task]:
+                    in_degree[succ] -= 1
+                    if in_degree[succ] == 0:
+                        ready.append(succ)
+            if len(order) != len(in_degree):
+                raise ValueError('Dependencies contain a cycle')
+            self._order = order
+            self._position = {task: i for i, task in enumerate(order)}
+            self._pruned = False
+        return self._order
+
+    def _span(self, task):
+        data = self.store._data
+        return data[GTaskStore.START, task._index], data[GTaskStore.END, task._index]
+
+    def _forward(self, task):
+        start, end = self._span(task)
+        es = max([start] + [self.earliest_finish[pred] for pred in self.predecessors[task]])
+        return es, es + end - start
+
+    def _backward(self, task):
+        start, end = self._span(task)
+        lf = min([self.project_finish] + [self.latest_start[succ] for succ in self.successors[task]])
+        return lf - (end - start), lf
+
+    def compute(self):
+        """ Run the full forward and backward passes
+
+        :return: None
+        """
+        order = self.topological_order()
+        for task in order:
+            self.earliest_start[task], self.earliest_finish[task] = self._forward(task)
+        self.project_finish = max(self.earliest_finish.values(), default=None)
+        for task in reversed(order):
+            self.latest_start[task], self.latest_finish[task] = self._backward(task)
+        self._computed = True
+        self._loosened.clear()
+        self._freed.clear()
+
+    def refresh(self):
+        """ Bring the schedule up to date: in full after dependencies were added, incrementally from the ends of
+        the dependencies removed since the last pass otherwise
+
+        :return: Set of tasks whose schedule may have changed, or None after a full pass
+        """
+        if not self._computed:
+            self.compute()
+            return None
+        if not self._loosened and not self._freed:
+            return set()
+        return self._repropagate((), ())
+
+    def _propagate(self, seeds, neighbours, update, reverse):
+        """ Recompute values outwards from some tasks, in topological order, stopping where nothing changes
+
+        :param seeds: Tasks to start from
+        :param neighbours: Adjacency to follow
+        :param update: Function recomputing a task, returning True if its values changed
+        :param reverse: Walk against the topological order
+        :return: Set of tasks visited
+        """
+        sign = -1 if reverse else 1
+        heap = [(sign * self._position[task], id(task), task) for task in seeds]
+        heapq.heapify(heap)
+        queued = set(seeds)
+        visited = set()
+        while heap:
+            _, _, task = heapq.heappop(heap)
+            visited.add(task)
+            if update(task):
+                for other in neighbours[task]:
+                    if other not in queued:
+                        queued.add(other)
+                        heapq.heappush(heap, (sign * self._position[other], id(other), other))
+        return visited
+
+    def task_changed(self, task):
+        """ Re-propagate the schedule after a task's dates changed: earliest dates flow to downstream tasks only,
+        latest dates to upstream tasks only, unless the project finish moved
+
+        :param task: Task whose dates changed
+        :return: Set of tasks whose schedule may have changed
+        """
+        if not self._computed or task not in self.successors:
+            return set()
+        return self._repropagate([task], [task])
+
+    def _repropagate(self, forward_seeds, backward_seeds):
+        """ Re-propagate earliest dates downstream and latest dates upstream from some tasks, and from the ends of
+        the dependencies removed since the last pass
+
+        :param forward_seeds: Tasks whose earliest dates may have changed
+        :param backward_seeds: Tasks whose latest dates may have changed
+        :return: Set of tasks whose schedule may have changed
+        """
+        self.topological_order()
+        forward_seeds = [t for t in itertools.chain(forward_seeds, self._loosened) if t in self.successors]
+        backward_seeds = [t for t in itertools.chain(backward_seeds, self._freed) if t in self.successors]
+        self._loosened.clear()
+        self._freed.clear()
+
+        def forward(t):
+            values = self._forward(t)
+            if values == (self.earliest_start[t], self.earliest_finish[t]):
+                return False
+            self.earliest_start[t], self.earliest_finish[t] = values
+            return True
+
+        def backward(t):
+            values = self._backward(t)
+            if values == (self.latest_start[t], self.latest_finish[t]):
+                return False
+            self.latest_start[t], self.latest_finish[t] = values
+            return True
+
+        changed = self._propagate(forward_seeds, self.successors, forward, reverse=False)
+        finish = max(self.earliest_finish.values(), default=None)
+        if finish != self.project_finish:
+            self.project_finish = finish
+            for t in reversed(self._order):
+                self.latest_start[t], self.latest_finish[t] = self._backward(t)
+            return set(self.successors)
+        # Seed the backward pass with the changed task's predecessors as well, since its own latest start may not
+        # move even when its duration did
+        changed |= self._propagate(backward_seeds, self.predecessors, backward, reverse=True)
+        return changed
+
+    def slack(self, task):
+        """ Total slack of a task in days
+
+        :param task: Task in the graph
+        :return: Slack
+        """
+        self.refresh()
+        return self.latest_start[task] - self.earliest_start[task]
+
+    def is_critical(self, task):
+        return task in self.successors and self.slack(task) <= self.TOLERANCE
+
+    def is_critical_edge(self, start_task, end_task):
+        """ Whether a dependency lies on a critical path: both ends critical and the second driven by the first
+
+        :param start_task: Task that must finish first
+        :param end_task: Task that depends on it
+        :return: True if critical
+        """
+        return self.is_critical(start_task) and self.is_critical(end_task) and \
+            abs(self.earliest_finish[start_task] - self.earliest_start[end_task]) <= self.TOLERANCE
+
+    def critical_path(self):
+        """ Tasks with no slack, in topological order
+
+        :return: List of tasks
+        """
+        self.refresh()
+        return [task for task in self.topological_order() if self.is_critical(task)]
+
+
+class GObstacleIndex:
+    """ The task bars seen as obstacles for arrow routing: merged x intervals per row for clearance queries, and a
+    fingerprint per row that changes whenever any bar on the row changes. Rebuilt lazily when the store changes.
+    """
+    PAD = 0.1  # Padding drawn around each bar
+    WALK = 8  # Rows tested one at a time before testing the rest of a column in one go
+
+    def __init__(self, store, layout):
+        """ Obstacle index
+
+        :param store: Task store that holds the bars
+        :param layout: Row layout model of the occupied rows
+        """
+        self.store = store
+        self.layout = layout
+        self.stats = None  # GStats counting clash checks, set by the viewer
+        self._version = -1
+        self._row_keys = {}
+        self._row_runs = {}
+        self._runs = (np.zeros(0), np.zeros(0), np.zeros(0))
+
+    def build(self):
+        """ Rebuild the index if any bar changed
+
+        :return: None
+        """
+        store = self.store
+        if self._version == store.version:
+            return
+        order = np.lexsort((store.start_x, store.row_y))
+        rows = store.row_y[order]
+        starts = store.start_x[order]
+        ends = store.end_x[order]
+        self._row_keys = {}
+        self._row_runs = {}
+        self._runs = (np.zeros(0), np.zeros(0), np.zeros(0))
+        if len(order):
+            splits = np.flatnonzero(np.diff(rows)) + 1
+            start_list, end_list = starts.tolist(), ends.tolist()
+            for lo, hi in zip([0] + splits.tolist(), splits.tolist() + [len(order)]):
+                self._row_keys[float(rows[lo])] = hash((tuple(start_list[lo:hi]), tuple(end_list[lo:hi])))
+            starts = starts - self.PAD
+            ends = ends + self.PAD
+            # Shift every row clear of the one before so one running maximum merges the overlapping bars per row
+            shift = rows * (ends.max() - starts.min() + 1)
+            reach = np.maximum.accumulate(ends + shift)
+            breaks = np.flatnonzero(np.concatenate(([True], (starts + shift)[1:] > reach[:-1])))
+            run_rows = rows[breaks]
+            run_starts = starts[breaks]
+            run_ends = reach[np.concatenate((breaks[1:], [len(order)])) - 1] - shift[breaks]
+            self._runs = (run_rows, run_starts, run_ends)
+            splits = np.flatnonzero(np.diff(run_rows)) + 1
+            for lo, hi in zip(np.concatenate(([0], splits)), np.concatenate((splits, [len(breaks)]))):
+                self._row_runs[float(run_rows[lo])] = (run_starts[lo:hi].tolist(), run_ends[lo:hi].tolist())
+        self._version = store.version
+
+    def fingerprint(self, lo, hi):
+        """ Fingerprint of the bars on the rows from lo to hi, along with the nearest row either side since the
+        channels next to the span depend on them
+
+        :param lo: Lowest row
+        :param hi: Highest row
+        :return: Hashable fingerprint
+        """
+        self.build()
+        rows = self.layout._rows
+        spanned = rows[max(bisect.bisect_left(rows, lo) - 1, 0):bisect.bisect_right(rows, hi) + 1]
+        keys = self._row_keys
+        return hash((tuple(spanned), tuple([keys.get(row) for row in spanned])))
+
+    def runs(self, row):
+        """ Merged runs of padded bars on a row
+
+        :param row: Row
+        :return: Tuple of (sorted run starts, run ends), or None if the row is empty
+        """
+        return self._row_runs.get(row)
+
+    def blocking(self, row, x):
+        """ Find the merged run of bars on a row that covers an x position
+
+        :param row: Row to look in
+        :param x: X position
+        :return: Tuple of (start, end) of the run, or None if x is clear
+        """
+        if self.stats is not None:
+            self.stats.count('clash_checks')
+        runs = self._row_runs.get(row)
+        if runs is None:
+            return None
+        i = bisect.bisect_right(runs[0], x) - 1
+        if i >= 0 and runs[1][i] > x:
+            return runs[0][i], runs[1][i]
+        return None
+
+    def clear(self, row, x0, x1):
+        """ Whether no bar on a row lies between two x positions
+
+        :param row: Row to look in
+        :param x0: Left x position
+        :param x1: Right x position
+        :return: True if clear
+        """
+        if self.stats is not None:
+            self.stats.count('clash_checks')
+        runs = self._row_runs.get(row)
+        if runs is None:
+            return True
+        i = bisect.bisect_right(runs[0], x1) - 1
+        return i < 0 or runs[1][i] <= x0
+
+    def first_blocked(self, x, after, until, direction, lookahead=None):
+        """ Find the first row a vertical line at x runs into. Rows are walked one at a time, since in a dense
+        chart the line is blocked within a few rows; once it has run clear for a while the rest of the way is tested
+        in one vectorised pass over the merged bars.
+
+        :param x: X position of the line
+        :param after: Row the line starts from, not itself checked
+        :param until: Row the line ends on, not itself checked
+        :param direction: 1 for up, -1 for down
+        :param lookahead: Only look this many rows ahead, the whole way if not given
+        :return: Tuple of (first blocked row or None if clear, number of rows passed)
+        """
+        rows = self.layout._rows
+        if direction > 0:
+            i, stop = bisect.bisect_right(rows, after), bisect.bisect_left(rows, until)
+        else:
+            i, stop = bisect.bisect_left(rows, after) - 1, bisect.bisect_right(rows, until) - 1
+        total = abs(stop - i)
+        limit = total if lookahead is None else min(total, lookahead)
+        for passed in range(min(limit, self.WALK)):
+            if self.blocking(rows[i], x) is not None:
+                return float(rows[i]), passed
+            i += direction
+        if limit <= self.WALK:
+            return None, limit
+        # Vectorised test of the remaining rows
+        if self.stats is not None:
+            self.stats.count('clash_checks')
+        remaining = rows[i:i + limit - self.WALK] if direction > 0 else rows[i - limit + self.WALK + 1:i + 1]
+        run_rows, run_starts, run_ends = self._runs
+        j0 = int(np.searchsorted(run_rows, remaining[0], side='left'))
+        j1 = int(np.searchsorted(run_rows, remaining[-1], side='right'))
+        blocked = run_rows[j0:j1][(run_starts[j0:j1] < x) & (x < run_ends[j0:j1])]
+        if not len(blocked):
+            return None, limit
+        row = float(blocked[0] if direction > 0 else blocked[-1])
+        return row, self.WALK + abs(bisect.bisect_left(remaining, row) - (0 if direction > 0 else len(remaining) - 1))
+
+
+class GPathCache:
+    """ Least recently used memo of finished arrow paths, keyed by the arrow end points and the fingerprint of the
+    obstacles around them, so identical geometry is only ever routed once
+    """
+
+    def __init__(self, maxsize=4096):
+        """ Path cache
+
+        :param maxsize: Most paths kept
+        """
+        self.maxsize = maxsize
+        self._paths = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._paths)
+
+    def get(self, key):
+        """ Look up a path
+
+        :param key: Key of the path
+        :return: Cached value, or None
+        """
+        value = self._paths.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._paths.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """ Store a path, dropping the least recently used one if full
+
+        :param key: Key of the path
+        :param value: Value to store
+        :return: None
+        """
+        self._paths[key] = value
+        self._paths.move_to_end(key)
+        if len(self._paths) > self.maxsize:
+            self._paths.popitem(last=False)
+
+    def clear(self):
+        self._paths.clear()
+
+
+def _corner_templates(curve):
+    """ Unit rounded corners, as offsets from the start of the corner in units of the radius
+
+    :param curve: Distance of the Bezier control points along the tangent, as a fraction of the radius
+    :return: Tuple of (templates keyed by (rotation direction, quadrant), templates keyed by (incoming, outgoing)
+             unit directions)
+    """
+    c = curve
+    quadrants = {
+        (0, 0): ((0, 0), (c, 0), (1, -c), (1, -1)),
+        (0, 1): ((0, 0), (0, -c), (-1 + c, -1), (-1, -1)),
+        (0, 2): ((0, 0), (-c, 0), (-1, 1 - c), (-1, 1)),
+        (0, 3): ((0, 0), (0, c), (1 - c, 1), (1, 1)),
+        (1, 0): ((0, 0), (0, c), (-1 + c, 1), (-1, 1)),
+        (1, 1): ((0, 0), (c, 0), (1, 1 - c), (1, 1)),
+        (1, 2): ((0, 0), (0, -c), (1 - c, -1), (1, -1)),
+        (1, 3): ((0, 0), (-c, 0), (-1, -c), (-1, -1)),
+    }
+    turns = {}
+    for u in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+        for v in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            if u[0] * v[1] - u[1] * v[0]:
+                end = (u[0] + v[0], u[1] + v[1])
+                turns[u, v] = ((0, 0), (c * u[0], c * u[1]), (end[0] - c * v[0], end[1] - c * v[1]), end)
+    return ({key: np.array(value, dtype=float) for key, value in quadrants.items()},
+            {key: np.array(value, dtype=float) for key, value in turns.items()})
+
+
+class GPathBuffer:
+    """ Growable NumPy vertex and code arrays that arrow paths are built in. Rounded corners are stamped into them
+    from precomputed unit templates, scaled by the radius and moved to the corner.
+    """
+    CURVE = 0.75  # Distance of the Bezier control points along the tangent, as a fraction of the radius
+    QUADRANTS, TURNS = _corner_templates(CURVE)
+    CORNER_CODES = np.array([mpath.Path.LINETO, mpath.Path.CURVE4, mpath.Path.CURVE4, mpath.Path.CURVE4],
+                            dtype=mpath.Path.code_type)
+
+    def __init__(self, capacity=32):
+        """ Path buffer
+
+        :param capacity: Number of vertices to allocate up front
+        """
+        self.verts = np.empty((capacity, 2))
+        self.codes = np.empty(capacity, dtype=mpath.Path.code_type)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def _reserve(self, n):
+        """ Make room for n more vertices
+
+        :param n: Number of vertices
+        :return: Index of the first of them
+        """
+        i = self.size
+        if i + n > len(self.codes):
+            capacity = max(2 * len(self.codes), i + n)
+            verts = np.empty((capacity, 2))
+            verts[:i] = self.verts[:i]
+            codes = np.empty(capacity, dtype=mpath.Path.code_type)
+            codes[:i] = self.codes[:i]
+            self.verts, self.codes = verts, codes
+        self.size = i + n
+        return i
+
+    def move_to(self, point):
+        i = self._reserve(1)
+        self.verts[i] = point
+        self.codes[i] = mpath.Path.MOVETO
+
+    def line_to(self, point):
+        i = self._reserve(1)
+        self.verts[i] = point
+        self.codes[i] = mpath.Path.LINETO
+
+    def _stamp(self, template, radius, start_point):
+        i = self._reserve(4)
+        np.multiply(template, radius, out=self.verts[i:i + 4])
+        self.verts[i:i + 4] += start_point
+        self.codes[i:i + 4] = self.CORNER_CODES
+        return i
+
+    def corner(self, radius, start_point, rotation_direction, quadrant):
+        """ Add a rounded corner, see GDependencyArrow.add_curved_corner_to_path
+
+        :param radius: Radius of the curved corner
+        :param start_point: Starting point for the corner
+        :param rotation_direction: Clockwise = 0, Anti-clockwise = -1
+        :param quadrant: Quadrant of the circle, 0 = 12-3, 1 = 3-6, 2 = 6-9, 3 = 9-12
+        :return: Index of the first vertex of the corner
+        """
+        return self._stamp(self.QUADRANTS[0 if rotation_direction == 0 else 1, quadrant], radius, start_point)
+
+    def turn(self, point, incoming, outgoing, radius):
+        """ Add a rounded corner turning at a point between two axis aligned directions
+
+        :param point: Corner point
+        :param incoming: Unit direction into the corner, e.g. (1, 0)
+        :param outgoing: Unit direction out of the corner
+        :param radius: Radius of the curved corner
+        :return: Index of the first vertex of the corner
+        """
+        return self._stamp(self.TURNS[incoming, outgoing], radius,
+                           (point[0] - radius * incoming[0], point[1] - radius * incoming[1]))
+
+    def path(self, order=None):
+        """ Finished path holding a copy of the vertices
+
+        :param order: Optional indices of the vertices to take, in order
+        :return: Path
+        """
+        if order is None:
+            return mpath.Path(self.verts[:self.size].copy(), self.codes[:self.size].copy())
+        return mpath.Path(self.verts[order], self.codes[order])
+
+
+class GOrthogonalRouter:
+    """ Routes dependency arrows as orthogonal paths through the channels between rows. An arrow runs straight
+    down its column while the rows allow it and jogs sideways in the channel before a blocked row to whichever clear
+    edge of the blocking bars stays clear for the most rows. The jog points only depend on the bars, so arrows
+    detouring around the same bars share the same corridors. Finished paths are memoised by their end points and
+    the fingerprint of the bars on the rows they span.
+    """
+    CLEARANCE = 0.25  # Distance kept from the ends of bars, also the length of the arrow head
+    RADIUS = 0.125  # Radius of the rounded corners
+    LOOKAHEAD = 16  # Rows looked ahead when comparing where to cross a blocked row
+
+    def __init__(self, obstacles, cache=None):
+        """ Orthogonal arrow router
+
+        :param obstacles: Obstacle index of the task bars
+        :param cache: Path cache to memoise routes in, a private one if not given
+        """
+        self.obstacles = obstacles
+        self.layout = obstacles.layout
+        self.cache = cache if cache is not None else GPathCache()
+        self.stats = None  # GStats counting routed arrows, set by the viewer
+
+    def _crossing_x(self, row, x, target, until, direction):
+        """ Pick where to cross a blocked row: an edge of the blocking bars, or the target column if that is clear,
+        whichever then runs furthest before the next blocked row, the shortest detour breaking ties
+
+        :param row: Row to cross
+        :param x: Current x position
+        :param target: X position the arrow is heading for
+        :param until: Row the arrow ends on
+        :param direction: 1 for up, -1 for down
+        :return: X position clear of the bars on the row
+        """
+        obstacles = self.obstacles
+        row_starts, row_ends = obstacles.runs(row)
+        i = bisect.bisect_right(row_starts, x) - 1
+        candidates = [target] if obstacles.blocking(row, target) is None else []
+        # Either side of the blocking bars, keeping clear of them but splitting narrow gaps down the middle
+        gap = row_starts[i] - row_ends[i - 1] if i > 0 else math.inf
+        candidates.append(row_starts[i] - min(self.CLEARANCE, gap / 2))
+        gap = row_starts[i + 1] - row_ends[i] if i + 1 < len(row_starts) else math.inf
+        candidates.append(row_ends[i] + min(self.CLEARANCE, gap / 2))
+        best = None
+        for candidate in candidates:
+            _, reach = obstacles.first_blocked(candidate, row, until, direction, self.LOOKAHEAD)
+            score = (reach, -abs(candidate - x) - abs(candidate - target))
+            if best is None or score > best[0]:
+                best = (score, candidate)
+        return best[1]
+
+    def _channel(self, row, direction):
+        """ Y position of the channel between a row and the next occupied row in a direction
+
+        :param row: Row
+        :param direction: 1 for up, -1 for down
+        :return: Y position
+        """
+        rows = self.layout._rows
+        i = bisect.bisect_right(rows, row) if direction > 0 else bisect.bisect_left(rows, row) - 1
+        if 0 <= i < len(rows):
+            return (row + rows[i]) / 2
+        return row + direction * 0.5
+
+    def _waypoints(self, start, end):
+        """ Corner points of the orthogonal route between the end of one bar and the start of another
+
+        :param start: (x, y) of the end of the start task
+        :param end: (x, y) of the start of the end task
+        :return: List of (x, y) points
+        """
+        obstacles = self.obstacles
+        (sx, sy), (ex, ey) = start, end
+        target = ex - self.CLEARANCE
+        if sy == ey and sx + self.CLEARANCE <= target and obstacles.clear(ey, sx, ex):
+            return [start, end]
+        direction = 1 if ey > sy else -1
+        x = sx + self.CLEARANCE
+        points = [start, (x, sy)]
+        row = sy
+        while sy != ey:
+            row, _ = obstacles.first_blocked(x, row, ey, direction)
+            if row is None:
+                break
+            crossing = self._crossing_x(row, x, target, ey, direction)
+            channel = self._channel(row, -direction)
+            points += [(x, channel), (crossing, channel)]
+            x = crossing
+        if x != target:
+            if sy != ey and x < target and obstacles.clear(ey, x, ex):
+                # Drop straight onto the end row and run along it
+                points.append((x, ey))
+            else:
+                channel = self._channel(ey, -direction)
+                points += [(x, channel), (target, channel), (target, ey)]
+        else:
+            points.append((target, ey))
+        points.append(end)
+        return points
+
+    def _rounded_path(self, points):
+        """ Build a path through corner points with rounded corners
+
+        :param points: List of (x, y) points
+        :return: Path
+        """
+        buffer = GPathBuffer(4 * len(points))
+        buffer.move_to(points[0])
+        for (ax_, ay), (px, py), (bx, by) in zip(points, points[1:], points[2:]):
+            la = abs(px - ax_) + abs(py - ay)  # Segments are axis aligned
+            lb = abs(bx - px) + abs(by - py)
+            radius = min(self.RADIUS, la / 2, lb / 2)
+            if radius == 0:
+                continue
+            incoming = (int(px > ax_) - int(px < ax_), int(py > ay) - int(py < ay))
+            outgoing = (int(bx > px) - int(bx < px), int(by > py) - int(by < py))
+            if incoming == outgoing:
+                continue  # Straight through
+            buffer.turn((px, py), incoming, outgoing, radius)
+        buffer.line_to(points[-1])
+        return mpath.Path(buffer.verts[:len(buffer)], buffer.codes[:len(buffer)])
+
+    def route(self, arrow):
+        """ Route one arrow, reusing the memoised path if its end points and the bars around it are unchanged
+
+        :param arrow: Arrow to route
+        :return: Tuple of (path, head end points)
+        """
+        store = self.obstacles.store
+        data = store._data
+        start = (float(data[GTaskStore.END, arrow.start_task._index]), float(data[GTaskStore.ROW, arrow.start_task._index]))
+        end = (float(data[GTaskStore.START, arrow.end_task._index]), float(data[GTaskStore.ROW, arrow.end_task._index]))
+        key = ('orthogonal', start, end, self.obstacles.fingerprint(min(start[1], end[1]), max(start[1], end[1])))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        if self.stats is not None:
+            self.stats.count('arrows_routed')
+        route = (self._rounded_path(self._waypoints(start, end)), ((end[0] - self.CLEARANCE, end[1]), end))
+        self.cache.put(key, route)
+        return route
+
+    def route_all(self, arrows):
+        """ Route many arrows in one pass over a single build of the obstacle index
+
+        :param arrows: Arrows to route
+        :return: List of (path, head end points) tuples
+        """
+        self.obstacles.build()
+        # Keep every arrow's route in the cache, so the next pass only routes what changed
+        self.cache.maxsize = max(self.cache.maxsize, 2 * len(arrows))
+        return [self.route(arrow) for arrow in arrows]
+
+
+class GHitIndex:
+    """ Spatial index used to hit-test mouse events: tasks are bucketed by row, then searched by x interval, and
+    arrows are filtered by their bounding boxes before the exact path test. The boxes are kept in the same order as
+    the viewer's arrows and updated arrow by arrow as they are added, re-routed and removed.
+    """
+    HALF_HEIGHT = 0.35  # Half the bar height plus the bar padding
+    PAD = 0.1
+    ARROW_TOLERANCE = 0.15
+
+    def __init__(self):
+        self._valid = False
+        self._store_version = -1
+        self._rows = {}
+        self._arrows = []
+        self._arrow_boxes = np.zeros((16, 4))
+        self._dirty = {}
+
+    def invalidate(self):
+        """ Mark the task rows as stale so they are rebuilt on the next query
+
+        :return: None
+        """
+        self._valid = False
+
+    def add_arrow(self, arrow, box=None):
+        """ Append an arrow, which must be the last one in the viewer's arrow list
+
+        :param arrow: Arrow to add
+        :param box: Optional (x0, x1, y0, y1) box of its path, worked out on the next query if not given
+        :return: None
+        """
+        n = len(self._arrows)
+        if n == len(self._arrow_boxes):
+            self._arrow_boxes = np.concatenate((self._arrow_boxes, np.zeros_like(self._arrow_boxes)))
+        self._arrows.append(arrow)
+        if box is None:
+            self._dirty[arrow] = None
+        else:
+            self._arrow_boxes[n] = box
+
+    def extend_arrows(self, arrows, boxes):
+        """ Append many arrows at once, in the order of the viewer's arrow list
+
+        :param arrows: Arrows to add
+        :param boxes: Array of shape (len(arrows), 4) of the (x0, x1, y0, y1) boxes of their paths
+        :return: None
+        """
+        n, m = len(self._arrows), len(arrows)
+        if n + m > len(self._arrow_boxes):
+            grown = np.zeros((max(2 * len(self._arrow_boxes), n + m), 4))
+            grown[:n] = self._arrow_boxes[:n]
+            self._arrow_boxes = grown
+        self._arrow_boxes[n:n + m] = boxes
+        self._arrows.extend(arrows)
+
+    def arrow_moved(self, arrow):
+        """ Note that an arrow's path has changed so its box is worked out again on the next query
+
+        :param arrow: Re-routed arrow
+        :return: None
+        """
+        self._dirty[arrow] = None
+
+    def remove_arrow(self, i):
+        """ Remove the arrow at an index, moving the last one into its slot as the viewer does
+
+        :param i: Index of the arrow in the viewer's arrow list
+        :return: None
+        """
+        self._dirty.pop(self._arrows[i], None)
+        last = len(self._arrows) - 1
+        self._arrow_boxes[i] = self._arrow_boxes[last]
+        moved = self._arrows.pop()
+        if i < last:
+            self._arrows[i] = moved
+
+    def build(self, viewer):
+        """ Bring the index up to date with the viewer's tasks and arrows
+
+        :param viewer: Gantt chart viewer to index
+        :return: None
+        """
+        if self._dirty:
+            for arrow in self._dirty:
+                self._arrow_boxes[arrow._viewer_index] = GArrowPool._box(arrow.path)
+            self._dirty = {}
+        geom = viewer.store
+        if self._valid and self._store_version == geom.version:
+            return
+        order = np.lexsort((geom.start_x, geom.row_y))
+        rows = geom.row_y[order]
+        starts = geom.start_x[order] - self.PAD
+        ends = geom.end_x[order] + self.PAD
+        splits = np.flatnonzero(np.diff(rows)) + 1
+        self._rows = {}
+        for lo, hi in zip(np.concatenate(([0], splits)), np.concatenate((splits, [len(order)]))):
+            if lo == hi:
+                continue
+            # Running maximum of the end points lets a backwards scan stop as soon as nothing further left can reach x
+            self._rows[int(rows[lo])] = (starts[lo:hi], np.maximum.accumulate(ends[lo:hi]), ends[lo:hi],
+                                         [geom.tasks[i] for i in order[lo:hi]])
+        self._store_version = geom.version
+        self._valid = True
+
+    def find_task(self, x, y):
+        """ Find the task whose bar contains a point
+
+        :param x: X position in data coordinates
+        :param y: Y position in data coordinates
+        :return: Task under the point, or None
+        """
+        row = int(round(y))
+        if abs(y - row) > self.HALF_HEIGHT or row not in self._rows:
+            return None
+        starts, max_ends, ends, tasks = self._rows[row]
+        i = int(np.searchsorted(starts, x, side='right')) - 1
+        while i >= 0 and max_ends[i] >= x:
+            if ends[i] >= x:
+                return tasks[i]
+            i -= 1
+        return None
+
+    def find_arrows(self, x, y):
+        """ Find the drawn arrows whose bounding boxes contain a point
+
+        :param x: X position in data coordinates
+        :param y: Y position in data coordinates
+        :return: List of candidate arrows
+        """
+        boxes = self._arrow_boxes[:len(self._arrows)]
+        tol = self.ARROW_TOLERANCE
+        mask = (boxes[:, 0] - tol <= x) & (x <= boxes[:, 1] + tol) & (boxes[:, 2] - tol <= y) & (y <= boxes[:, 3] + tol)
+        # Arrows outside the materialised window have no artists to test against
+        return [arrow for arrow in (self._arrows[i] for i in np.flatnonzero(mask)) if arrow.arrow_patch]
+
+
+class GBarCollection:
+    """ Batched renderer that keeps every task bar and progress overlay in two PolyCollections backed by NumPy
+    arrays, so a redraw costs two draw calls however many tasks there are
+    """
+    BAR_HEIGHT = 0.5
+    PAD = 0.1  # Matches the padding of the rounded FancyBboxPatch bars, which is also their corner radius
+    # Path codes of a rounded bar, laid out as BoxStyle.Round lays them out
+    ROUND_CODES = np.array([mpath.Path.MOVETO, mpath.Path.LINETO] +
+                           [mpath.Path.CURVE3, mpath.Path.CURVE3, mpath.Path.LINETO] * 3 +
+                           [mpath.Path.CURVE3, mpath.Path.CURVE3, mpath.Path.CLOSEPOLY], dtype=mpath.Path.code_type)
+
+    def __init__(self, ax):
+        """ Batched bar renderer
+
+        :param ax: Axes to draw the bars on
+        """
+        self.ax = ax
+        self.tasks = []
+        self._size = 0
+        self._bar_verts = np.zeros((16, 4, 2))
+        self._progress_verts = np.zeros((16, 4, 2))
+        self._facecolors = np.zeros((16, 4))
+        self._edgecolors = np.zeros((16, 4))
+        self._linewidths = np.zeros(16)
+        self._window = None
+        self._dirty = False
+        self.bars = _GSyncedPolyCollection(self, [], closed=True)
+        self.progress = _GSyncedPolyCollection(self, [], closed=True, facecolors='darkblue', edgecolors='none',
+                                               alpha=0.7)
+        ax.add_collection(self.bars, autolim=False)
+        ax.add_collection(self.progress, autolim=False)
+
+    def _grow(self):
+        """ Double the capacity of the backing arrays
+
+        :return: None
+        """
+        capacity = 2 * len(self._linewidths)
+        for attr in ('_bar_verts', '_progress_verts', '_facecolors', '_edgecolors', '_linewidths'):
+            old = getattr(self, attr)
+            new = np.zeros((capacity,) + old.shape[1:])
+            new[:self._size] = old[:self._size]
+            setattr(self, attr, new)
+
+    def _set_geometry(self, i, task):
+        """ Write the bar and progress rectangles of a task into row i of the vertex arrays
+
+        :param i: Index of the task in the collection
+        :param task: Task to take the geometry from
+        :return: None
+        """
+        start, end, row = task._store._data[GTaskStore.START:GTaskStore.ROW + 1, task._index]
+        x0 = start - self.PAD
+        x1 = end + self.PAD
+        xp = x0 + task.duration * task.progress + 2 * self.PAD
+        y0 = row - self.BAR_HEIGHT / 2 - self.PAD
+        y1 = row + self.BAR_HEIGHT / 2 + self.PAD
+        self._bar_verts[i] = ((x0, y0), (x0, y1), (x1, y1), (x1, y0))
+        self._progress_verts[i] = ((x0, y0), (x0, y1), (xp, y1), (xp, y0))
+
+    def add(self, task):
+        """ Add a task to the collection
+
+        :param task: Task to add, which must already be in the viewer's task store
+        :return: None
+        """
+        if self._size == len(self._linewidths):
+            self._grow()
+        i = self._size
+        task._bars = self
+        task._bar_index = i
+        self.tasks.append(task)
+        self._set_geometry(i, task)
+        self._facecolors[i] = mcolors.to_rgba(task.facecolor)
+        self._edgecolors[i] = mcolors.to_rgba('none')
+        self._linewidths[i] = 0
+        self._size += 1
+        self._dirty = True
+        self.bars.stale = True
+
+    def extend(self, tasks):
+        """ Add many tasks to the collection, working out their geometry in one vectorised pass
+
+        :param tasks: Tasks to add, which must already be in the viewer's task store
+        :return: None
+        """
+        if not tasks:
+            return
+        first = self._size
+        size = first + len(tasks)
+        while size > len(self._linewidths):
+            self._grow()
+        for i, task in enumerate(tasks, first):
+            task._bars = self
+            task._bar_index = i
+        self.tasks.extend(tasks)
+        data = tasks[0]._store._data[:, [task._index for task in tasks]]
+        start, end, row, progress = data[GTaskStore.START], data[GTaskStore.END], data[GTaskStore.ROW], \
+            data[GTaskStore.PROGRESS]
+        x0 = start - self.PAD
+        x1 = end + self.PAD
+        xp = x0 + np.floor(end - start + 1e-9) * progress + 2 * self.PAD
+        y0 = row - self.BAR_HEIGHT / 2 - self.PAD
+        y1 = row + self.BAR_HEIGHT / 2 + self.PAD
+        self._bar_verts[first:size] = np.stack((np.stack((x0, y0), -1), np.stack((x0, y1), -1),
+                                                np.stack((x1, y1), -1), np.stack((x1, y0), -1)), 1)
+        self._progress_verts[first:size] = np.stack((np.stack((x0, y0), -1), np.stack((x0, y1), -1),
+                                                     np.stack((xp, y1), -1), np.stack((xp, y0), -1)), 1)
+        # Convert each distinct colour once, tasks mostly share a handful of them
+        palette = {}
+        codes = np.fromiter((palette.setdefault(task.facecolor, len(palette)) for task in tasks), int, len(tasks))
+        self._facecolors[first:size] = np.array([mcolors.to_rgba(colour) for colour in palette])[codes]
+        self._edgecolors[first:size] = mcolors.to_rgba('none')
+        self._linewidths[first:size] = 0
+        self._size = size
+        self._dirty = True
+        self.bars.stale = True
+
+    def remove(self, task):
+        """ Remove a task from the collection by moving the last task into its slot
+
+        :param task: Task to remove
+        :return: None
+        """
+        i = task._bar_index
+        last = self._size - 1
+        if i != last:
+            moved = self.tasks[last]
+            for arr in (self._bar_verts, self._progress_verts, self._facecolors, self._edgecolors,
+                        self._linewidths):
+                arr[i] = arr[last]
+            self.tasks[i] = moved
+            moved._bar_index = i
+        self.tasks.pop()
+        self._size -= 1
+        task._bars = None
+        task._bar_index = None
+        self._dirty = True
+        self.bars.stale = True
+
+    def update(self, task):
+        """ Refresh the geometry of a task after its dates or progress changed
+
+        :param task: Task to refresh
+        :return: None
+        """
+        self._set_geometry(task._bar_index, task)
+        self._dirty = True
+        self.bars.stale = True
+
+    def set_style(self, task, facecolor=None, edgecolor=None, linewidth=None):
+        """ Change the style of a single bar in place
+
+        :param task: Task whose bar is restyled
+        :param facecolor: New face colour
+        :param edgecolor: New edge colour
+        :param linewidth: New edge line width
+        :return: None
+        """
+        i = task._bar_index
+        if facecolor is not None:
+            self._facecolors[i] = mcolors.to_rgba(facecolor)
+        if edgecolor is not None:
+            self._edgecolors[i] = mcolors.to_rgba(edgecolor)
+        if linewidth is not None:
+            self._linewidths[i] = linewidth
+        self._dirty = True
+        self.bars.stale = True
+
+    def set_window(self, window):
+        """ Only push the bars that intersect a window into the collections
+
+        :param window: Tuple of (x0, x1, y0, y1) in data coordinates, or None to push every bar
+        :return: None
+        """
+        self._window = window
+        self._dirty = True
+        self.bars.stale = True
+
+    @classmethod
+    def _rounded(cls, verts):
+        """ Turn padded rectangles into the outlines of rounded bars, the corners being quadratic Bezier curves
+
+        :param verts: Array of shape (n, 4, 2) of rectangles as kept in the vertex arrays
+        :return: Array of shape (n, 14, 2) of vertices to go with ROUND_CODES
+        """
+        x0, y0 = verts[:, 0, 0], verts[:, 0, 1]
+        x1, y1 = verts[:, 2, 0], verts[:, 2, 1]
+        r = cls.PAD
+        points = ((x0 + r, y0), (x1 - r, y0), (x1, y0), (x1, y0 + r), (x1, y1 - r), (x1, y1), (x1 - r, y1),
+                  (x0 + r, y1), (x0, y1), (x0, y1 - r), (x0, y0 + r), (x0, y0), (x0 + r, y0), (x0 + r, y0))
+        return np.stack([np.stack(point, -1) for point in points], 1)
+
+    def sync(self):
+        """ Push the backing arrays into the collections, only if anything changed since the last sync. The bars
+        are kept as plain rectangles and only rounded for those pushed.
+
+        :return: None
+        """
+        if not self._dirty:
+            return
+        n = self._size
+        if self._window is None:
+            shown = slice(0, n)
+        else:
+            x0, x1, y0, y1 = self._window
+            verts = self._bar_verts[:n]
+            shown = np.flatnonzero((verts[:, 2, 0] >= x0) & (verts[:, 0, 0] <= x1) &
+                                   (verts[:, 1, 1] >= y0) & (verts[:, 0, 1] <= y1))
+        bars = self._rounded(self._bar_verts[shown])
+        codes = [self.ROUND_CODES] * len(bars)
+        self.bars.set_verts_and_codes(bars, codes)
+        self.bars.set_facecolor(self._facecolors[shown])
+        self.bars.set_edgecolor(self._edgecolors[shown])
+        self.bars.set_linewidth(self._linewidths[shown])
+        self.progress.set_verts_and_codes(self._rounded(self._progress_verts[shown]), codes)
+        self._dirty = False
+
+
+class GArrowPool:
+    """ Keeps dependency arrows routed but only gives artists to those that intersect the materialised window,
+    recycling the artists of arrows that scroll out of it
+    """
+    MARGIN = 0.5  # Fraction of the view size materialised either side of the view
+
+    def __init__(self, ax):
+        """ Arrow artist pool
+
+        :param ax: Axes to draw the arrows on
+        """
+        self.ax = ax
+        self.arrows = []
+        self._boxes = np.zeros((16, 4))
+        self._free = []
+        self._window = None
+
+    def add(self, arrow):
+        """ Add a routed arrow, giving it artists straight away if it is inside the window
+
+        :param arrow: Arrow whose path has been routed
+        :return: None
+        """
+        if len(self.arrows) == len(self._boxes):
+            self._boxes = np.concatenate((self._boxes, np.zeros_like(self._boxes)))
+        self._boxes[len(self.arrows)] = self._box(arrow.path)
+        arrow._pool_index = len(self.arrows)
+        self.arrows.append(arrow)
+        if self._window is None or self._in_window(self._boxes[arrow._pool_index], self._window):
+            self._show(arrow)
+
+    def extend(self, arrows, boxes):
+        """ Add many routed arrows at once, giving artists only to those inside the window
+
+        :param arrows: Arrows whose paths have been routed
+        :param boxes: Array of shape (n, 4) of their (x0, x1, y0, y1) boxes
+        :return: None
+        """
+        first = len(self.arrows)
+        size = first + len(arrows)
+        if size > len(self._boxes):
+            grown = np.zeros((max(size, 2 * len(self._boxes)), 4))
+            grown[:first] = self._boxes[:first]
+            self._boxes = grown
+        self._boxes[first:size] = boxes
+        for i, arrow in enumerate(arrows, first):
+            arrow._pool_index = i
+        self.arrows.extend(arrows)
+        if self._window is None:
+            shown = range(first, size)
+        else:
+            window = self._window
+            boxes = self._boxes[first:size]
+            shown = first + np.flatnonzero((boxes[:, 1] >= window[0]) & (boxes[:, 0] <= window[1]) &
+                                           (boxes[:, 3] >= window[2]) & (boxes[:, 2] <= window[3]))
+        for i in shown:
+            self._show(self.arrows[i])
+
+    def remove(self, arrow):
+        """ Remove an arrow, returning its artists to the pool
+
+        :param arrow: Arrow to remove
+        :return: None
+        """
+        self._hide(arrow)
+        i = arrow._pool_index
+        last = len(self.arrows) - 1
+        if i != last:
+            moved = self.arrows[last]
+            self._boxes[i] = self._boxes[last]
+            self.arrows[i] = moved
+            moved._pool_index = i
+        self.arrows.pop()
+
+    def update(self, arrow):
+        """ Refresh an arrow whose route changed, showing or hiding it if it moved across the window edge
+
+        :param arrow: Arrow that was routed again
+        :return: None
+        """
+        box = self._boxes[arrow._pool_index]
+        box[:] = self._box(arrow.path)
+        if self._window is not None and not self._in_window(box, self._window):
+            self._hide(arrow)
+        elif arrow.arrow_patch:
+            arrow.arrow_patch[0].set_path(arrow.path)
+            arrow.arrow_patch[1].set_positions(*arrow.head)
+        else:
+            self._show(arrow)
+
+    @staticmethod
+    def _box(path):
+        """ Bounding box of a path from its vertices, which with the Bezier control points included always contains
+        the curve and is far cheaper than the exact extents
+
+        :param path: Arrow path
+        :return: Tuple of (x0, x1, y0, y1)
+        """
+        verts = path.vertices
+        (x0, y0), (x1, y1) = verts.min(axis=0), verts.max(axis=0)
+        return x0, x1, y0, y1
+
+    @staticmethod
+    def _in_window(box, window):
+        return box[1] >= window[0] and box[0] <= window[1] and box[3] >= window[2] and box[2] <= window[3]
+
+    def _show(self, arrow):
+        """ Give an arrow a pair of artists, reusing free ones where possible
+
+        :param arrow: Arrow to show
+        :return: None
+        """
+        if arrow.arrow_patch:
+            return
+        if self._free:
+            patch, head = self._free.pop()
+            patch.set_path(arrow.path)
+            patch.set_linewidth(1.5)
+            patch.set_edgecolor(arrow.colour)
+            head.set_positions(*arrow.head)
+            head.set_color(arrow.colour)
+            patch.set_visible(True)
+            head.set_visible(True)
+        else:
+            patch = patches.PathPatch(arrow.path, edgecolor=arrow.colour, linewidth=1.5, facecolor='none')
+            head = patches.FancyArrowPatch(*arrow.head, mutation_scale=20, color=arrow.colour, arrowstyle='->')
+            self.ax.add_artist(patch)
+            self.ax.add_artist(head)
+        arrow.arrow_patch = (patch, head)
+
+    def _hide(self, arrow):
+        """ Take an arrow's artists back into the pool
+
+        :param arrow: Arrow to hide
+        :return: None
+        """
+        if arrow.arrow_patch:
+            patch, head = arrow.arrow_patch
+            patch.set_visible(False)
+            head.set_visible(False)
+            self._free.append(arrow.arrow_patch)
+            arrow.arrow_patch = None
+
+    def set_window(self, window):
+        """ Materialise the arrows that intersect a window and release the rest
+
+        :param window: Tuple of (x0, x1, y0, y1) in data coordinates
+        :return: None
+        """
+        self._window = window
+        n = len(self.arrows)
+        boxes = self._boxes[:n]
+        visible = (boxes[:, 1] >= window[0]) & (boxes[:, 0] <= window[1]) & \
+                  (boxes[:, 3] >= window[2]) & (boxes[:, 2] <= window[3])
+        # Release first so the artists can be reused by the arrows coming into view
+        for i in np.flatnonzero(~visible):
+            self._hide(self.arrows[i])
+        for i in np.flatnonzero(visible):
+            self._show(self.arrows[i])
+
 
-    def add_task(self, task):
-        self.tasks.append(task)
-        task.draw(self.ax)
+class _GSyncedPolyCollection(PolyCollection):
+    """ PolyCollection that flushes its owning GBarCollection before drawing, so bulk changes are pushed once """
 
-    def remove_task(self, task):
-        if task in self.tasks:
-            task.remove(self.ax)
-            self.tasks.remove(task)
+    def __init__(self, owner, verts, **kwargs):
+        super().__init__(verts, **kwargs)
+        self._owner = owner
 
-    def add_arrow(self, arrow):
-        self.arrows.append(arrow)
-        arrow.set_viewer(self)
-        arrow.draw(self.ax)
+    def draw(self, renderer):
+        self._owner.sync()
+        super().draw(renderer)
 
-    def remove_arrow(self, arrow):
-        if arrow in self.arrows:
-            arrow.remove(self.ax)
-            self.arrows.remove(arrow)
 
-    def add_scrollbar(self, scrollbar):
-        self.scrollbars.append(scrollbar)
-        scrollbar.link(self)
+def _to_timestamp(value):
+    """ Convert a value to a pandas Timestamp, skipping the parser when it already is one
 
-    def remove_scrollbar(self, scrollbar):
-        if scrollbar in self.scrollbars:
-            scrollbar.unlink(self)
-            self.scrollbars.remove(scrollbar)
+    :param value: Date string, datetime or Timestamp
+    :return: Timestamp
+    """
+    import pandas as pd
+    if isinstance(value, pd.Timestamp):
+        return value
+    return pd.to_datetime(value)
 
-    def show(self):
-        # Set x-axis and y-axis limits to fit all tasks
-        if self.tasks:
-            min_start = min(task.start for task in self.tasks)
-            max_end = max(task.end for task in self.tasks)
-            self.ax.set_xlim(mdates.date2num(min_start) - 1, mdates.date2num(max_end) + 1)
-            self.ax.set_ylim(-0.5, len(self.tasks) - 0.5)
-        plt.tight_layout()
-        plt.show()
 
+def _num_to_timestamp(num):
+    """ Convert a Matplotlib day number back to a pandas Timestamp
 
-    def draw(self):
-        """Call the draw function of the plot
+    :param num: Day number
+    :return: Timestamp
+    """
+    import pandas as pd
+    return pd.Timestamp(np.datetime64(mdates.get_epoch(), 'us') + np.timedelta64(round(num * 86400e6), 'us'))
+
+
+class GBlitOverlay:
+    """ Animated overlay layer for hover and selection feedback. The figure is cached after every full draw and
+    changes are shown by restoring the cache, drawing the overlay artists on top and blitting.
+    """
+    PAD = 0.1
+    HALF_HEIGHT = 0.35
+
+    def __init__(self, viewer):
+        """ Blitting overlay
+
+        :param viewer: Gantt chart viewer to draw the overlay on
+        """
+        self.viewer = viewer
+        self.task_patch = patches.Rectangle((0, 0), 0, 0, facecolor='lightgreen', edgecolor='black', linewidth=1.5,
+                                            animated=True, visible=False, zorder=5)
+        self.arrow_patch = patches.PathPatch(mpath.Path([(0, 0)]), facecolor='none', edgecolor='gray',
+                                             linewidth=3.0, animated=True, visible=False, zorder=5)
+        viewer.ax.add_artist(self.task_patch)
+        viewer.ax.add_artist(self.arrow_patch)
+        self._background = None
+        self._draw_id = viewer.fig.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def disconnect(self):
+        """ Stop caching the figure after each draw
 
         :return: None
         """
-        if self.tasks:
-            min_start = min(task.start for task in self.tasks)
-            max_end = max(task.end for task in self.tasks)
-            self.ax.set_xlim(mdates.date2num(min_start) - 1, mdates.date2num(max_end) + 1)
-            self.ax.set_ylim(-0.5, len(self.tasks) - 0.5)
-        plt.tight_layout()
-        plt.draw()
+        if self._draw_id is not None:
+            self.viewer.fig.canvas.mpl_disconnect(self._draw_id)
+            self._draw_id = None
 
-class GScrollBar:
-    def __init__(self, orientation='horizontal'):
-        self.orientation = orientation
-        self.slider = None
+    def _on_draw(self, event):
+        """ Cache the freshly drawn figure and put the overlay back on top of it
 
-    def link(self, viewer):
-        axcolor = 'lightgoldenrodyellow'
-        if self.orientation == 'horizontal':
-            ax_hscroll = viewer.fig.add_axes([0.1, 0.05, 0.65, 0.03], facecolor=axcolor)
-            self.slider = Slider(ax_hscroll, 'Scroll X', mdates.date2num(viewer.tasks[0].start - timedelta(days=1)),
-                                 mdates.date2num(viewer.tasks[-1].end + timedelta(days=1)),
-                                 valinit=mdates.date2num(viewer.tasks[0].start - timedelta(days=1)))
-            self.slider.on_changed(lambda val: self.update(val, viewer))
-        elif self.orientation == 'vertical':
-            ax_vscroll = viewer.fig.add_axes([0.85, 0.1, 0.03, 0.65], facecolor=axcolor)
-            self.slider = Slider(ax_vscroll, 'Scroll Y', 0, len(viewer.tasks)-1, valinit=0, valstep=1, orientation='vertical')
-            self.slider.on_changed(lambda val: self.update(val, viewer))
+        :param event: Matplotlib draw event
+        :return: None
+        """
+        canvas = self.viewer.fig.canvas
+        if not getattr(canvas, 'supports_blit', False):
+            return
+        self._background = canvas.copy_from_bbox(self.viewer.fig.bbox)
+        self._draw_overlay()
 
-    def unlink(self, viewer):
-        if self.slider:
-            self.slider.disconnect_events()
-            self.slider = None
+    def _draw_overlay(self):
+        ax = self.viewer.ax
+        for artist in (self.task_patch, self.arrow_patch):
+            if artist.get_visible():
+                ax.draw_artist(artist)
+
+    def show_task(self, task, facecolor='lightgreen'):
+        """ Highlight a task bar
+
+        :param task: Task to highlight, or None to clear the highlight
+        :param facecolor: Colour of the highlight
+        :return: None
+        """
+        if task is None:
+            self.task_patch.set_visible(False)
+            return
+        positions = task.get_positions()
+        x_start, x_end = positions['start'][0], positions['end'][0]
+        row = positions['start'][1]
+        self.task_patch.set_bounds(x_start - self.PAD, row - self.HALF_HEIGHT, x_end - x_start + 2 * self.PAD,
+                                   2 * self.HALF_HEIGHT)
+        self.task_patch.set_facecolor(facecolor)
+        self.task_patch.set_visible(True)
+
+    def show_arrow(self, arrow):
+        """ Highlight a dependency arrow
+
+        :param arrow: Arrow to highlight, or None to clear the highlight
+        :return: None
+        """
+        if arrow is None:
+            self.arrow_patch.set_visible(False)
+            return
+        self.arrow_patch.set_path(arrow.path)
+        self.arrow_patch.set_visible(True)
+
+    def blit(self):
+        """ Restore the cached figure, draw the overlay and blit it to the screen
+
+        :return: True if blitted, False if there is no cached figure yet and a full redraw is needed
+        """
+        if self._background is None:
+            return False
+        canvas = self.viewer.fig.canvas
+        canvas.restore_region(self._background)
+        self._draw_overlay()
+        canvas.blit(self.viewer.fig.bbox)
+        return True
+
+    def blit_axes(self, ax):
+        """ Redraw a single axes, such as a scrollbar, straight onto the screen
+
+        :param ax: Axes to redraw
+        :return: None
+        """
+        canvas = self.viewer.fig.canvas
+        if self._background is not None:
+            self.viewer.fig.draw_artist(ax)
+            canvas.blit(ax.bbox)
+
+
+class GTileCache:
+    """ Horizontal scrolling from cached tiles. The time axis is cut into tiles about as wide as the scroll window,
+    each tile is rendered once to an off-screen buffer and the visible window is composed from the two tiles under
+    it. Tiles are laid on whole pixels and only the columns fully inside the axes are kept, so they join without a
+    seam. Edits only drop the tiles their old and new extents overlap, and the least recently used tiles are dropped
+    once there are more than maxsize.
+    """
+    PAD_PIXELS = 3
+
+    def __init__(self, viewer, maxsize=16):
+        """ Tile cache
+
+        :param viewer: Gantt chart viewer to render tiles of
+        :param maxsize: Number of tiles to keep
+        """
+        if maxsize < 2:
+            raise ValueError("The tile cache must hold at least the two tiles under the window")
+        self.viewer = viewer
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._tiles = OrderedDict()
+        self._frame = None
+        self._signature = None
+        self._stride = None
+        self._snapshot = None
+        self._snapshot_version = -1
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def invalidate(self, x_start=None, x_end=None):
+        """ Drop the tiles overlapping a range of the time axis
+
+        :param x_start: Start of the range as a day number, or None to drop every tile
+        :param x_end: End of the range as a day number
+        :return: None
+        """
+        if x_start is None or self._signature is None:
+            self._tiles.clear()
+            return
+        # Antialiased edges and line widths spill a few pixels past the data extents
+        pad = self._signature[0] * self.PAD_PIXELS / max(self.viewer.ax.bbox.width, 1)
+        # The last column of a tile is also the first of the next one
+        first = math.floor((x_start - pad) / self._stride) - 1
+        last = math.floor((x_end + pad) / self._stride)
+        for index in [index for index in self._tiles if first <= index <= last]:
+            del self._tiles[index]
+
+    def _invalidate_path(self, path):
+        if path is not None and len(path.vertices):
+            xs = path.vertices[:, 0]
+            self.invalidate(xs.min(), xs.max())
+
+    def _sync(self):
+        """ Drop the tiles touched by task edits since the last call. Arrows drop the tiles under their old and new
+        paths as they are placed, re-routed and removed.
+
+        :return: None
+        """
+        viewer = self.viewer
+        store = viewer.store
+        if viewer.lanes.stale:
+            viewer.relayout()
+        version = store.version
+        if version == self._snapshot_version:
+            return
+        data = store._data[:, :len(store)]
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.shape != data.shape:
+            # Tasks were added or removed, so the columns no longer line up
+            self._tiles.clear()
+        else:
+            for i in np.flatnonzero((snapshot != data).any(axis=0)):
+                self.invalidate(min(snapshot[store.START, i], data[store.START, i]),
+                                max(snapshot[store.END, i], data[store.END, i]))
+        viewer.route_arrows()
+        self._snapshot = data.copy()
+        self._snapshot_version = version
+
+    @staticmethod
+    @contextmanager
+    def _hidden(artists):
+        """ Hide some artists for the duration of a render """
+        visible = [artist.get_visible() for artist in artists]
+        for artist in artists:
+            artist.set_visible(False)
+        try:
+            yield
+        finally:
+            for artist, was_visible in zip(artists, visible):
+                artist.set_visible(was_visible)
+
+    def _tile_mode(self):
+        """ Hide the overlay artists, the axes frame and the axis ticks so they are not baked into tiles """
+        ax = self.viewer.ax
+        overlay = self.viewer._overlay
+        artists = list(ax.spines.values()) + [ax.xaxis, ax.yaxis]
+        if overlay is not None:
+            artists += [overlay.task_patch, overlay.arrow_patch]
+        return self._hidden(artists)
+
+    def _render_tile(self, left, width):
+        ax = self.viewer.ax
+        canvas = self.viewer.fig.canvas
+        ax.set_xlim(left, left + width)
+        canvas.draw()
+        return canvas.copy_from_bbox(ax.bbox)
+
+    def _render_frame(self):
+        """ Render the figure without the chart contents and the x axis, which are drawn again on every scroll """
+        ax = self.viewer.ax
+        artists = [ax.xaxis] + ax.collections[:] + ax.patches[:] + ax.lines[:] + ax.images[:] + ax.texts[:] + \
+            ax.artists[:]
+        with self._hidden(artists):
+            self.viewer.fig.canvas.draw()
+        return self.viewer.fig.canvas.copy_from_bbox(self.viewer.fig.bbox)
+
+    def scroll_to(self, x_start, width):
+        """ Show a window of the time axis composed from cached tiles
+
+        :param x_start: Start of the window as a day number
+        :param width: Width of the window in days
+        :return: True if the window was shown, False if the canvas cannot blit and a full redraw is needed
+        """
+        viewer = self.viewer
+        ax = viewer.ax
+        canvas = viewer.fig.canvas
+        if not getattr(canvas, 'supports_blit', False):
+            return False
+        signature = (width, ax.get_ylim(), tuple(ax.bbox.bounds), viewer.fig.dpi)
+        bbox = ax.bbox
+        days_per_pixel = width / bbox.width
+        # Columns c0 to c1 - 1 are fully inside the axes, tiles step by one column less so neighbours share one
+        c0, c1 = math.ceil(bbox.x0), math.floor(bbox.x1)
+        pixels = c1 - c0 - 1
+        inset = (c0 - bbox.x0) * days_per_pixel
+        if signature != self._signature:
+            self._signature = signature
+            self._stride = pixels * days_per_pixel
+            self._tiles.clear()
+            self._frame = None
+        self._sync()
+
+        # Snap the window to whole pixels so the tile columns line up with the screen
+        u = round((x_start + inset) / days_per_pixel)
+        first, offset = divmod(u, pixels)
+        with self._tile_mode():
+            for index in (first, first + 1):
+                if index in self._tiles:
+                    self.hits += 1
+                    self._tiles.move_to_end(index)
+                else:
+                    self.misses += 1
+                    self._tiles[index] = self._render_tile(index * self._stride - inset, width)
+        if self._frame is None:
+            self._frame = self._render_frame()
+        while len(self._tiles) > self.maxsize:
+            self._tiles.popitem(last=False)
+
+        x_start = u * days_per_pixel - inset
+        ax.set_xlim(x_start, x_start + width)
+        canvas.restore_region(self._frame)
+        left, right = self._tiles[first], self._tiles[first + 1]
+        x1, y1, x2, y2 = left.get_extents()
+        # Columns of the left tile from the offset on, then the columns of the right tile after the shared one.
+        # The position is relative to the start of the region.
+        canvas.restore_region(left, bbox=(c0 + offset, y1, c1, y2), xy=(c0 - offset - (c0 - x1), y1))
+        if offset:
+            canvas.restore_region(right, bbox=(c0 + 1, y1, c0 + 1 + offset, y2),
+                                  xy=(c1 - offset - (c0 + 1 - x1), y1))
+        for spine in ax.spines.values():
+            ax.draw_artist(spine)
+        ax.draw_artist(ax.xaxis)
+        if viewer._overlay is not None:
+            viewer._overlay._on_draw(None)
+        canvas.blit(viewer.fig.bbox)
+        return True
+
+
+class GLevelOfDetail:
+    """ Switches how the chart is drawn by zoom level. Zoomed in, bars and arrows are drawn in full. Once bars or
+    rows are only a few pixels across, the bars are drawn as plain rectangles in a single collection. Once they are
+    about a pixel, each band of rows is drawn as a density strip, binned with NumPy from the task store, and the
+    arrows are hidden. The strips are cached per power-of-two zoom bucket, so zooming back and forth reuses them.
+    The level is switched when the view, the axes size or the tasks change, never while the figure is drawing.
+    """
+    NEAR, MID, FAR = 'near', 'mid', 'far'
+    MID_PIXELS = 6  # Bars narrower or rows shorter than this on screen are drawn as plain rectangles
+    FAR_PIXELS = 1.5  # and below this as density strips
+    BIN_PIXELS = 2  # Rough size on screen of a density strip cell
+    MAX_CELLS = 2 ** 21  # Most cells in one density image, coarser buckets are used beyond it
+
+    def __init__(self, viewer, maxsize=8):
+        """ Level of detail switcher
+
+        :param viewer: Gantt chart viewer to draw
+        :param maxsize: Most density images kept
+        """
+        self.viewer = viewer
+        self.maxsize = maxsize
+        self.level = self.NEAR
+        self.hits = 0
+        self.misses = 0
+        self._strips = OrderedDict()  # (x bucket, y bucket) -> (store version, AxesImage)
+        self._buckets = (None, None)
+        self._applied = None
+        self._rects_key = None
+        self._style_version = 0
+        self._duration = (None, None)
+        self.rects = PolyCollection([], closed=True, edgecolors='none', visible=False)
+        viewer.ax.add_collection(self.rects, autolim=False)
+        viewer.ax.add_artist(_GLevelMark(self))
+        self._limit_ids = [viewer.ax.callbacks.connect('xlim_changed', self._on_change),
+                           viewer.ax.callbacks.connect('ylim_changed', self._on_change)]
+        self._resize_id = viewer.fig.canvas.mpl_connect('resize_event', self._on_change)
+
+    def disconnect(self):
+        """ Stop following the view and the figure size
+
+        :return: None
+        """
+        for cid in self._limit_ids:
+            self.viewer.ax.callbacks.disconnect(cid)
+        self._limit_ids = []
+        if self._resize_id is not None:
+            self.viewer.fig.canvas.mpl_disconnect(self._resize_id)
+            self._resize_id = None
+
+    def _on_change(self, event):
+        """ Switch level after the limits of the axes or the size of the figure changed
+
+        :param event: Axes or resize event, unused
+        :return: None
+        """
+        self.update()
+
+    def invalidate(self):
+        """ Drop the cached rectangles after tasks were restyled, e.g. by the critical path highlight
+
+        :return: None
+        """
+        self._style_version += 1
+
+    def _typical_duration(self):
+        """ Median task duration in days, recomputed only when the store changes """
+        store = self.viewer.store
+        if self._duration[0] != store.version:
+            self._duration = (store.version, float(np.median(store.end_x - store.start_x)))
+        return self._duration[1]
+
+    def _choose(self):
+        """ Pick the level for the current view and axes size
+
+        :return: Tuple of (level, x bucket, y bucket), the buckets being None when zoomed in
+        """
+        ax = self.viewer.ax
+        (x0, y0), (x1, y1) = ax.viewLim.get_points()
+        width, height = ax.bbox.width, ax.bbox.height
+        if not len(self.viewer.store) or width <= 0 or height <= 0 or x0 == x1 or y0 == y1:
+            return self.NEAR, None, None
+        days_per_pixel = abs(x1 - x0) / width
+        rows_per_pixel = abs(y1 - y0) / height
+        pixels = min(self._typical_duration() / days_per_pixel, 1 / rows_per_pixel)
+        if pixels >= self.MID_PIXELS:
+            return self.NEAR, None, None
+        if pixels >= self.FAR_PIXELS:
+            return self.MID, None, None
+        x_bucket = math.floor(math.log2(days_per_pixel * self.BIN_PIXELS))
+        y_bucket = max(0, math.floor(math.log2(rows_per_pixel * self.BIN_PIXELS)))
+        return self.FAR, x_bucket, y_bucket
+
+    def update(self):
+        """ Switch to the level for the current view, showing the artists of that level and hiding the rest
+
+        :return: None
+        """
+        viewer = self.viewer
+        level, x_bucket, y_bucket = self._choose()
+        changed = level != self.level
+        self.level = level
+        # Tasks and arrows added since the last switch get the visibility of the level too
+        applied = (level, len(viewer.store), len(viewer.arrows))
+        if applied != self._applied:
+            self._applied = applied
+            self._show_detail(level)
+        if level == self.MID:
+            self._sync_rects()
+        self.rects.set_visible(level == self.MID)
+        self._buckets = (x_bucket, y_bucket)
+        if changed and viewer._arrow_pool is not None:
+            if level == self.FAR:
+                viewer._arrow_pool.set_window(_NOWHERE)
+            else:
+                # Materialise the arrows in view again
+                viewer._window = None
+                viewer._cull()
+
+    def _show_detail(self, level):
+        """ Show or hide the full detail bars and the arrows
+
+        :param level: Level being switched to
+        :return: None
+        """
+        viewer = self.viewer
+        bars_shown = level == self.NEAR
+        if viewer._bars is not None:
+            viewer._bars.bars.set_visible(bars_shown)
+            viewer._bars.progress.set_visible(bars_shown)
+        else:
+            for task in viewer.store.tasks:
+                for patch in (task.rect_patch, task.progress_patch):
+                    if patch is not None:
+                        patch.set_visible(bars_shown)
+        if viewer._arrow_pool is None:
+            arrows_shown = level != self.FAR
+            for arrow in viewer.arrows:
+                if arrow.arrow_patch:
+                    for artist in arrow.arrow_patch:
+                        artist.set_visible(arrows_shown)
+
+    def _sync_rects(self):
+        """ Rebuild the plain rectangles if the tasks changed since they were built
+
+        :return: None
+        """
+        store = self.viewer.store
+        key = (store.version, self._style_version)
+        if key == self._rects_key:
+            return
+        self._rects_key = key
+        x0, x1, y = store.start_x, store.end_x, store.row_y
+        y0 = y - GTaskStore.BAR_HEIGHT / 2
+        y1 = y + GTaskStore.BAR_HEIGHT / 2
+        self.rects.set_verts(np.stack((np.stack((x0, y0), -1), np.stack((x0, y1), -1),
+                                       np.stack((x1, y1), -1), np.stack((x1, y0), -1)), 1))
+        palette = {}
+        codes = np.fromiter((palette.setdefault(task.facecolor, len(palette)) for task in store.tasks), int,
+                            len(store.tasks))
+        self.rects.set_facecolor(np.array([mcolors.to_rgba(colour) for colour in palette]).reshape(-1, 4)[codes])
+
+    def _strip(self, x_bucket, y_bucket):
+        """ The density image for a zoom bucket, from the cache if the tasks are unchanged
+
+        :param x_bucket: Log2 of the width of a cell in days
+        :param y_bucket: Log2 of the height of a cell in rows
+        :return: AxesImage
+        """
+        store = self.viewer.store
+        key = (x_bucket, y_bucket)
+        cached = self._strips.get(key)
+        if cached is not None and cached[0] == store.version:
+            self._strips.move_to_end(key)
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        image = self._render_strip(x_bucket, y_bucket)
+        self._strips[key] = (store.version, image)
+        self._strips.move_to_end(key)
+        while len(self._strips) > self.maxsize:
+            self._strips.popitem(last=False)
+        return image
+
+    def _render_strip(self, x_bucket, y_bucket):
+        """ Bin the tasks into a grid of cells and turn the share of each cell covered by bars into opacity. The
+        cells sit on a grid anchored at multiples of their width, so one image serves every pan at its zoom.
+
+        :param x_bucket: Log2 of the width of a cell in days
+        :param y_bucket: Log2 of the height of a cell in rows
+        :return: AxesImage
+        """
+        from matplotlib.image import AxesImage
+        store = self.viewer.store
+        starts, ends, rows = store.start_x, store.end_x, store.row_y
+        row_count = max(self.viewer.lanes.row_count, int(rows.max()) + 1)
+        while True:
+            width = 2.0 ** x_bucket
+            height = 2 ** y_bucket
+            origin = math.floor(starts.min() / width) * width
+            columns = max(1, math.ceil((ends.max() - origin) / width))
+            bands = math.ceil(row_count / height)
+            if columns * bands <= self.MAX_CELLS:
+                break
+            x_bucket += 1
+            y_bucket += 1
+        band = ((rows + 0.5) // height).astype(np.intp)
+
+        def covered(edges):
+            # Total length of bar to the left of each cell boundary, sum(max(0, k - u)) over the bars of a band
+            u = (edges - origin) / width
+            cells = band * (columns + 2) + np.ceil(u).astype(np.intp)
+            count = np.bincount(cells, minlength=bands * (columns + 2)).reshape(bands, columns + 2)
+            total = np.bincount(cells, u, minlength=bands * (columns + 2)).reshape(bands, columns + 2)
+            k = np.arange(columns + 1)
+            return k * np.cumsum(count, axis=1)[:, :columns + 1] - np.cumsum(total, axis=1)[:, :columns + 1]
+
+        coverage = np.diff(covered(starts) - covered(ends), axis=1) / height
+        rgba = np.empty((bands, columns, 4), dtype=np.float32)
+        rgba[...] = mcolors.to_rgba('skyblue')
+        # Square root so sparse rows stay visible next to busy ones
+        rgba[..., 3] = np.sqrt(np.clip(coverage, 0, 1))
+        # The extent is given to the constructor, since set_extent would also grow the data limits
+        ax = self.viewer.ax
+        image = AxesImage(ax, interpolation='nearest', origin='lower',
+                          extent=(origin, origin + columns * width, -0.5, bands * height - 0.5))
+        image.set_data(rgba)
+        image.set_transform(ax.transData)
+        image.set_clip_path(ax.patch)
+        return image
+
+
+class _GLevelMark(Artist):
+    """ Invisible artist drawn first on the axes, bringing the plain rectangles up to date and drawing the density
+    strips at the level chosen beforehand
+    """
+
+    def __init__(self, lod):
+        super().__init__()
+        self.lod = lod
+        self.set_zorder(-math.inf)
+
+    def draw(self, renderer):
+        lod = self.lod
+        if lod.level == lod.MID:
+            lod._sync_rects()
+        # The strips are drawn from here rather than added to the axes, which are already part way through drawing,
+        # and only at draw time so views passed through while setting limits are never binned
+        if lod.level == lod.FAR:
+            lod._strip(*lod._buckets).draw(renderer)
+
+
+class GStats:
+    """ Opt-in timers and counters for the viewer's hot paths. Each phase keeps its number of calls, total and
+    longest time; counters are plain event counts. A viewer without stats skips all of it.
+    """
+
+    def __init__(self):
+        self.timers = {}
+        self.counters = {}
+        self._render_start = None
+
+    def reset(self):
+        """ Forget every timing and count
+
+        :return: None
+        """
+        self.timers.clear()
+        self.counters.clear()
+
+    def record(self, name, elapsed):
+        """ Add one timing to a phase
+
+        :param name: Name of the phase
+        :param elapsed: Seconds spent
+        :return: None
+        """
+        timer = self.timers.get(name)
+        if timer is None:
+            self.timers[name] = [1, elapsed, elapsed]
+        else:
+            timer[0] += 1
+            timer[1] += elapsed
+            if elapsed > timer[2]:
+                timer[2] = elapsed
+
+    @contextmanager
+    def phase(self, name):
+        """ Context manager timing the code inside it as one call of a phase
+
+        :param name: Name of the phase
+        :return: None
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def count(self, name, n=1):
+        """ Add to a counter
+
+        :param name: Name of the counter
+        :param n: Amount to add
+        :return: None
+        """
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def as_dict(self):
+        """ Timings and counts as plain values, e.g. for JSON
+
+        :return: Dict of 'timers', mapping each phase to its calls, total_s and max_s, and 'counters'
+        """
+        return {'timers': {name: {'calls': calls, 'total_s': total, 'max_s': longest}
+                           for name, (calls, total, longest) in self.timers.items()},
+                'counters': dict(self.counters)}
+
+    def report(self):
+        """ Timings and counts as a text table, slowest phase first
+
+        :return: String
+        """
+        lines = [f"{'phase':<16}{'calls':>8}{'total ms':>11}{'max ms':>9}"]
+        for name, (calls, total, longest) in sorted(self.timers.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:<16}{calls:>8}{total * 1e3:>11.1f}{longest * 1e3:>9.2f}")
+        lines.extend(f"{name:<16}{value:>8}" for name, value in sorted(self.counters.items()))
+        return '\n'.join(lines)
+
+    def log(self, logger=None, level=logging.INFO):
+        """ Write the report to a logger
+
+        :param logger: Logger to write to, this module's if not given
+        :param level: Logging level
+        :return: None
+        """
+        (logger if logger is not None else logging.getLogger(__name__)).log(level, '%s', self.report())
+
+
+class _GRenderMark(Artist):
+    """ Invisible figure artist drawn before everything else, marking when a render starts so the viewer's
+    draw_event handler can time the whole render
+    """
+
+    def __init__(self, stats):
+        super().__init__()
+        self.stats = stats
+        self.set_zorder(-math.inf)
+
+    def draw(self, renderer):
+        self.stats._render_start = time.perf_counter()
 
-    def update(self, val, viewer):
-        if self.orientation == 'horizontal':
-            x_offset = mdates.num2date(val)
-            viewer.ax.set_xlim(x_offset, x_offset + timedelta(days=10))
-        elif self.orientation == 'vertical':
-            y_offset = int(val)
-            viewer.ax.set_ylim(y_offset - 0.5, y_offset + len(viewer.tasks) - 0.5)
-        viewer.fig.canvas.draw_idle()
 
 class GTask:
-    def __init__(self, name, start, end, progress=0):
-        self.name = name
-        self.start = pd.to_datetime(start)
-        self.end = pd.to_datetime(end)
-        self.progress = progress
-        self.duration = (self.end - self.start).days
+    # Tasks can number in the hundreds of thousands, so no per-instance __dict__. Once added to a viewer the
+    # name, dates, row and progress live in the viewer's GTaskStore and the task is just a view onto them.
+    PRESS_COLOURS = {1: 'yellow', 2: 'red', 3: 'orange'}  # Left, middle and right click
+    __slots__ = ('_name', '_start', '_end', '_row', '_progress', '_store', '_index', '_bars', '_bar_index',
+                 'rect_patch', 'progress_patch', 'hover', 'facecolor', 'group')
+
+    def __init__(self, name, start, end, progress=0, group=None):
+        self._store = None
+        self._index = None
+        self._bars = None
+        self._bar_index = None
         self.rect_patch = None
         self.progress_patch = None
+        self._name = sys.intern(name)
+        self._start = _to_timestamp(start)
+        self._end = _to_timestamp(end)
+        self._row = None
+        self._progress = progress
         self.hover = False
+        self.facecolor = 'skyblue'
+        self.group = group  # Swimlane of the task
+
+    @classmethod
+    def _view(cls, store, index, group=None):
+        """ Task that is a view onto a column already in a store, skipping the parsing done by __init__
+
+        :param store: Task store holding the task's data
+        :param index: Index of the task in the store
+        :param group: Swimlane of the task
+        :return: Task
+        """
+        task = cls.__new__(cls)
+        task._store = store
+        task._index = index
+        task._bars = None
+        task._bar_index = None
+        task.rect_patch = None
+        task.progress_patch = None
+        task._name = task._start = task._end = task._row = task._progress = None
+        task.hover = False
+        task.facecolor = 'skyblue'
+        task.group = group
+        return task
+
+    @classmethod
+    def from_columns(cls, names, starts, ends, progress=None, date_format='ISO8601', groups=None):
+        """ Build many tasks from columns of values, parsing all the dates in one vectorised call
+
+        :param names: Sequence of task names
+        :param starts: Sequence of start dates, as strings or anything pandas can convert to datetimes
+        :param ends: Sequence of end dates
+        :param progress: Optional sequence of progress fractions, 0 for every task if not given
+        :param date_format: strftime format of the date strings, 'ISO8601' for any ISO 8601 dates
+        :param groups: Optional sequence of swimlane groups
+        :return: List of tasks
+        """
+        import pandas as pd
+        starts = pd.to_datetime(pd.Series(starts, copy=False), format=date_format)
+        ends = pd.to_datetime(pd.Series(ends, copy=False), format=date_format)
+        if progress is None:
+            progress = [0] * len(starts)
+        if groups is None:
+            groups = [None] * len(starts)
+        return [cls(name, start, end, prog, group)
+                for name, start, end, prog, group in zip(names, starts, ends, progress, groups)]
+
+    @property
+    def name(self):
+        if self._store is not None:
+            return self._store.names[self._index]
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        if self._store is not None:
+            self._store.names[self._index] = sys.intern(value)
+        else:
+            self._name = sys.intern(value)
+
+    @property
+    def start(self):
+        if self._store is not None:
+            return _num_to_timestamp(self._store._data[GTaskStore.START, self._index])
+        return self._start
+
+    @start.setter
+    def start(self, value):
+        if self._store is not None:
+            self._store.update(self._index, start=mdates.date2num(_to_timestamp(value)))
+        else:
+            self._start = _to_timestamp(value)
+        self._geometry_changed()
+
+    @property
+    def end(self):
+        if self._store is not None:
+            return _num_to_timestamp(self._store._data[GTaskStore.END, self._index])
+        return self._end
+
+    @end.setter
+    def end(self, value):
+        if self._store is not None:
+            self._store.update(self._index, end=mdates.date2num(_to_timestamp(value)))
+        else:
+            self._end = _to_timestamp(value)
+        self._geometry_changed()
+
+    @property
+    def duration(self):
+        if self._store is not None:
+            data = self._store._data
+            return math.floor(data[GTaskStore.END, self._index] - data[GTaskStore.START, self._index] + 1e-9)
+        return (self._end - self._start).days
+
+    @property
+    def row(self):
+        if self._store is not None:
+            return self._store._data[GTaskStore.ROW, self._index]
+        return self._row
+
+    @row.setter
+    def row(self, value):
+        if self._store is not None:
+            self._store.update(self._index, row=value)
+        else:
+            self._row = value
+        self._geometry_changed()
+
+    @property
+    def progress(self):
+        if self._store is not None:
+            return self._store._data[GTaskStore.PROGRESS, self._index]
+        return self._progress
+
+    @progress.setter
+    def progress(self, value):
+        if self._store is not None:
+            self._store.update(self._index, progress=value)
+        else:
+            self._progress = value
+        self._geometry_changed()
 
-    def draw(self, ax):
-        y_pos = len(ax.patches) // 2  # Adjust for both full and progress bars
+    def _geometry_changed(self):
+        """ Push new dates, row or progress out to whatever draws this task
+
+        :return: None
+        """
+        if self._bars is not None:
+            self._bars.update(self)
+        elif self.rect_patch and self.row is not None:
+            x_start = mdates.date2num(self.start)
+            for patch, width in ((self.rect_patch, self.duration), (self.progress_patch, self.duration * self.progress)):
+                patch.set_x(x_start)
+                patch.set_y(self.row - 0.25)
+                patch.set_width(width)
+
+    def draw(self, ax, autolim=True, row=None):
+        """ Draw the task bar and its progress overlay
+
+        :param ax: Axes to draw the task on
+        :param autolim: Whether to expand the data limits of the axes to include the bar
+        :param row: Row to draw the task on, the task's own row if not given
+        :return: None
+        """
+        y_pos = row if row is not None else self.row
+        if y_pos is None:
+            raise ValueError(f"Task '{self.name}' has no row, add it to a GanttViewer or pass a row")
+        self.row = y_pos
         rect = patches.FancyBboxPatch((mdates.date2num(self.start), y_pos - 0.25), self.duration, 0.5,
-                                      boxstyle="round,pad=0.1", edgecolor='none', facecolor='skyblue', linewidth=0)
+                                      boxstyle="round,pad=0.1", edgecolor='none', facecolor=self.facecolor, linewidth=0)
         progress_width = self.duration * self.progress
         progress_rect = patches.FancyBboxPatch((mdates.date2num(self.start), y_pos - 0.25), progress_width, 0.5,
                                                boxstyle="round,pad=0.1", edgecolor='none', facecolor='darkblue', alpha=0.7)
-        ax.add_patch(rect)
-        ax.add_patch(progress_rect)
+        add = ax.add_patch if autolim else ax.add_artist
+        add(rect)
+        add(progress_rect)
         self.rect_patch = rect
         self.progress_patch = progress_rect
 
-        # Connect event for hover and clicks
-        self.connect_events(ax)
-
     def remove(self, ax):
+        """ Remove the task's patches from the axes they were drawn on
+
+        :param ax: Axes the task was drawn on
+        :return: None
+        """
         if self.rect_patch:
-            ax.patches.remove(self.rect_patch)
+            self.rect_patch.remove()
+            self.rect_patch = None
         if self.progress_patch:
-            ax.patches.remove(self.progress_patch)
-
-    def connect_events(self, ax):
-        def on_hover(event):
-            if self.rect_patch.contains(event)[0]:
-                if not self.hover:
-                    self.hover = True
-                    self.rect_patch.set_edgecolor('black')
-                    self.rect_patch.set_linewidth(1.5)
-                    self.rect_patch.set_facecolor('lightgreen')  # Change color on hover
-                    ax.figure.canvas.draw_idle()
-            else:
-                if self.hover:
-                    self.hover = False
-                    self.rect_patch.set_edgecolor('none')
-                    self.rect_patch.set_linewidth(0)
-                    self.rect_patch.set_facecolor('skyblue')  # Revert color when not hovering
-                    ax.figure.canvas.draw_idle()
-
-        def on_click(event):
-            if self.rect_patch.contains(event)[0]:
-                if event.button == 1:  # Left click
-                    self.rect_patch.set_facecolor('yellow')
-                elif event.button == 2:  # Middle click
-                    self.rect_patch.set_facecolor('red')
-                elif event.button == 3:  # Right click
-                    self.rect_patch.set_facecolor('orange')
-                ax.figure.canvas.draw_idle()
-
-        def on_release(event):
-            if self.rect_patch.contains(event)[0]:
-                # If still hovering after release, set to hover color
-                self.rect_patch.set_facecolor('lightgreen')
-            else:
-                # Revert to original color when mouse button is released
-                self.rect_patch.set_facecolor('skyblue')
-            ax.figure.canvas.draw_idle()
+            self.progress_patch.remove()
+            self.progress_patch = None
+
+    def set_style(self, facecolor=None, edgecolor=None, linewidth=None):
+        """ Restyle the task bar, whether it is drawn as a patch or as part of a GBarCollection
+
+        :param facecolor: New face colour
+        :param edgecolor: New edge colour
+        :param linewidth: New edge line width
+        :return: None
+        """
+        if self._bars is not None:
+            self._bars.set_style(self, facecolor=facecolor, edgecolor=edgecolor, linewidth=linewidth)
+        elif self.rect_patch:
+            if facecolor is not None:
+                self.rect_patch.set_facecolor(facecolor)
+            if edgecolor is not None:
+                self.rect_patch.set_edgecolor(edgecolor)
+            if linewidth is not None:
+                self.rect_patch.set_linewidth(linewidth)
+
+    def set_hover(self, hover):
+        """ Highlight or un-highlight the task bar as the mouse moves over it
+
+        :param hover: True if the mouse is over the bar
+        :return: None
+        """
+        self.hover = hover
+        if hover:
+            self.set_style(facecolor='lightgreen', edgecolor='black', linewidth=1.5)  # Change color on hover
+        else:
+            self.set_style(facecolor=self.facecolor, edgecolor='none', linewidth=0)  # Revert color when not hovering
+
+    def press(self, button):
+        """ Colour the task bar according to the mouse button pressed on it
+
+        :param button: Mouse button, 1 = left, 2 = middle, 3 = right
+        :return: None
+        """
+        if button in self.PRESS_COLOURS:
+            self.set_style(facecolor=self.PRESS_COLOURS[button])
+
+    def release(self, inside):
+        """ Restore the task bar colour once the mouse button is released
 
-        self.rect_patch.figure.canvas.mpl_connect('motion_notify_event', on_hover)
-        self.rect_patch.figure.canvas.mpl_connect('button_press_event', on_click)
-        self.rect_patch.figure.canvas.mpl_connect('button_release_event', on_release)
+        :param inside: True if the mouse is still over the bar
+        :return: None
+        """
+        # If still hovering after release, set to hover color, otherwise revert to original color
+        self.set_style(facecolor='lightgreen' if inside else self.facecolor)
 
     def get_positions(self):
         """
         Returns the positions of the middle of each side of the rectangle (start, top, bottom, end).
         """
+        if self._store is not None:
+            return self._store.positions(self._index)
         x_start = mdates.date2num(self.start)
         x_end = mdates.date2num(self.end)
-        y_start = self.rect_patch.get_y()
-        y_end = y_start + self.rect_patch.get_height()
+        y_start = self.row - 0.25
+        y_end = y_start + 0.5
         return {
             'start': (x_start, y_start + 0.25),
             'end': (x_end, y_start + 0.25),
@@ -198,6 +3768,31 @@ class GDependencyArrow:
         self._start_task = start_task
         self._end_task = end_task
         self._viewer = None
+        self.path = None
+        self.head = None
+        self.arrow_patch = None
+        self._pool_index = None
+        self._viewer_index = None  # Position in the viewer's arrow list
+        self.colour = 'gray'
+
+    @property
+    def start_task(self):
+        return self._start_task
+
+    @property
+    def end_task(self):
+        return self._end_task
+
+    def set_colour(self, colour):
+        """ Change the colour of the arrow line and head
+
+        :param colour: New colour
+        :return: None
+        """
+        self.colour = colour
+        if self.arrow_patch:
+            self.arrow_patch[0].set_edgecolor(colour)
+            self.arrow_patch[1].set_color(colour)
 
 
     def set_viewer(self, viewer: GanttViewer):
@@ -207,17 +3802,8 @@ class GDependencyArrow:
         :return:
         """
         self._viewer = viewer
-        # Calculate the minimum spacing between bars
-        _first_task = self._viewer.tasks[0]
-        _first_task_top = _first_task.get_positions()['top']
-        _first_task_bot = _first_task.get_positions()['bottom']
-        self._task_gap = 200000000
-        # Cycle through all the bars in the viewer to find the smallest gap
-        for tsk in self._viewer.tasks:
-            if abs(_first_task_top[1] - tsk.get_positions()['bottom'][1]) < self._task_gap:
-                self._task_gap = abs(_first_task_top[1] - tsk.get_positions()['bottom'][1])
-            if abs(_first_task_bot[1] - tsk.get_positions()['top'][1]) < self._task_gap:
-                self._task_gap = abs(_first_task_bot[1] - tsk.get_positions()['top'][1])
+        # Minimum spacing between the first bar and all the others, maintained by the viewer's row layout
+        self._task_gap = self._viewer.layout.gap(self._viewer.tasks[0].row)
         self.arrow_patch = None
 
     @staticmethod
@@ -232,425 +3818,263 @@ class GDependencyArrow:
         :return: Updated path list
         """
 
-        radius_factor = 0.75  # 0.552284749831
-        curve_offset = radius * radius_factor  # Approximation for circular arcs using Bezier curves
-
-        if rotation_direction == 0:  # Clockwise
-            # print('rot 0')
-            if quadrant == 0:
-                # print('quad 0')
-                path_list.append((mpath.Path.LINETO, (start_point[0], start_point[1])))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] + curve_offset, start_point[1])))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] + radius, start_point[1] - curve_offset)))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] + radius, start_point[1] - radius)))
-            elif quadrant == 1:
-                # print('quad 1')
-                path_list.append((mpath.Path.LINETO, (start_point[0], start_point[1])))
-                path_list.append((mpath.Path.CURVE4, (start_point[0], start_point[1] - curve_offset)))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] - radius + curve_offset, start_point[1] - radius)))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] - radius, start_point[1] - radius)))
-            elif quadrant == 2:
-                # print('quad 2')
-                path_list.append((mpath.Path.LINETO, (start_point[0], start_point[1])))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] - curve_offset, start_point[1])))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] - radius, start_point[1] + radius - curve_offset)))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] - radius, start_point[1] + radius)))
-            elif quadrant == 3:
-                # print('quad 3')
-                path_list.append((mpath.Path.LINETO, (start_point[0], start_point[1])))
-                path_list.append((mpath.Path.CURVE4, (start_point[0], start_point[1] + curve_offset)))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] + radius - curve_offset, start_point[1] + radius)))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] + radius, start_point[1] + radius)))
-        else:  # Anti-clockwise
-            # print('rot 1')
-            if quadrant == 0:
-                # print('quad 0')
-                path_list.append((mpath.Path.LINETO, (start_point[0], start_point[1])))
-                path_list.append((mpath.Path.CURVE4, (start_point[0], start_point[1] + curve_offset)))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] - radius + curve_offset, start_point[1] + radius)))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] - radius, start_point[1] + radius)))
-            elif quadrant == 1:
-                # print('quad 1')
-                path_list.append((mpath.Path.LINETO, (start_point[0], start_point[1])))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] + curve_offset, start_point[1])))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] + radius, start_point[1] + radius - curve_offset)))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] + radius, start_point[1] + radius)))
-            elif quadrant == 2:
-                # print('quad 2')
-                path_list.append((mpath.Path.LINETO, (start_point[0], start_point[1])))
-                path_list.append((mpath.Path.CURVE4, (start_point[0], start_point[1] - curve_offset)))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] + radius - curve_offset, start_point[1] - radius)))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] + radius, start_point[1] - radius)))
-            elif quadrant == 3:
-                # print('quad 3')
-                path_list.append((mpath.Path.LINETO, (start_point[0], start_point[1])))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] - curve_offset, start_point[1])))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] - radius, start_point[1] - curve_offset)))
-                path_list.append((mpath.Path.CURVE4, (start_point[0] - radius, start_point[1] - radius)))
+        # Scale the unit corner for the rotation and quadrant, with the Bezier control points approximating an arc
+        template = GPathBuffer.QUADRANTS[0 if rotation_direction == 0 else 1, quadrant]
+        for code, (dx, dy) in zip(GPathBuffer.CORNER_CODES.tolist(), template.tolist()):
+            path_list.append((code, (start_point[0] + radius * dx, start_point[1] + radius * dy)))
         return path_list
 
-    def draw(self, ax):
-        """ Function to draw the dependency arrow
+    def route(self):
+        """ Work out the path of the dependency arrow around the task bars
 
-        :param ax: Axes to draw the dependency arrow
-        :return:
+        :return: Path of the arrow line, also kept in self.path along with the arrow head end points in self.head
         """
+        if self._viewer is not None and self._viewer.router is not None:
+            self.path, self.head = self._viewer.router.route(self)
+            return self.path
+
         # Get the start and end positions
-        start_pos = self._start_task.get_positions()['end']
-        # print(self._start_task.name)
-        # print(self._end_task.name)
+        start_positions = self._start_task.get_positions()
+        start_pos = start_positions['end']
         end_pos = self._end_task.get_positions()['start']
+        control_offset = 0.25
+
+        # Reuse the finished path if nothing about the arrow or the bars around it has changed
+        cache = key = None
+        if self._viewer is not None:
+            cache = self._viewer.path_cache
+            key = ('legacy', start_pos, end_pos, self._task_gap,
+                   self._viewer.obstacles.fingerprint(min(start_pos[1], end_pos[1]), max(start_pos[1], end_pos[1])))
+            cached = cache.get(key)
+            if cached is not None:
+                self.path, self.head = cached
+                return self.path
+            if self._viewer.stats is not None:
+                self._viewer.stats.count('arrows_routed')
 
         # Draw the dependency path with rounded corners using Bezier curves
-        control_offset = 0.25
         radius = control_offset * 0.5
-        radius_factor = 0.75  # 0.552284749831
-        curve_offset = radius * radius_factor  # Approximation for circular arcs using Bezier curves
-
-        arrow_path = [(mpath.Path.MOVETO, (start_pos[0], start_pos[1]))]
+        buffer = GPathBuffer(64)
+        buffer.move_to(start_pos)
 
         # Create an intelligent path based on the start and finish positions
-        # print("Start")
-        # print(start_pos)
-        # print(start_pos[0] + control_offset)
-        # print("End")
-        # print(end_pos[0] - control_offset)
-        # print(end_pos)
         if start_pos[0] + control_offset > end_pos[0] - control_offset and start_pos[1] > end_pos[1]:
             # print('Opt 0')
             # Theoretical position when the end of the start task is after the start of the end task in the pair
             # Start position is above the end position
-            arrow_path = self.add_curved_corner_to_path(arrow_path,
-                                                        radius,
-                                                        (start_pos[0] + control_offset - radius, start_pos[1]),
-                                                        0,
-                                                        0)
-            arrow_path = self.add_curved_corner_to_path(arrow_path,
-                                                        radius,
-                                                        (start_pos[0] + control_offset,
-                                                         self._start_task.get_positions()['bottom'][1] - (self._task_gap / 2) + radius),
-                                                        0,
-                                                        1)
-            arrow_path = self.add_curved_corner_to_path(arrow_path,
-                                                        radius,
-                                                        (end_pos[0] - control_offset + radius,
-                                                         self._start_task.get_positions()['bottom'][1] - (
-                                                                     self._task_gap / 2)),
-                                                        1,
-                                                        3)
-            arrow_path = self.add_curved_corner_to_path(arrow_path,
-                                                        radius,
-                                                        (end_pos[0] - control_offset,
-                                                         end_pos[1] + control_offset - radius),
-                                                        1,
-                                                        2)
-            arrow_path.append((mpath.Path.LINETO, end_pos))
+            buffer.corner(radius, (start_pos[0] + control_offset - radius, start_pos[1]), 0, 0)
+            buffer.corner(radius,
+                          (start_pos[0] + control_offset, start_positions['bottom'][1] - (self._task_gap / 2) + radius),
+                          0, 1)
+            buffer.corner(radius,
+                          (end_pos[0] - control_offset + radius, start_positions['bottom'][1] - (self._task_gap / 2)),
+                          1, 3)
+            buffer.corner(radius, (end_pos[0] - control_offset, end_pos[1] + control_offset - radius), 1, 2)
+            buffer.line_to(end_pos)
 
         elif start_pos[0] + control_offset > end_pos[0] - control_offset and start_pos[1] < end_pos[1]:
             # print('Opt 1')
             # Theoretical position when the end of the start task is after the start of the end task in the pair
             # Start position is below the end position
-            arrow_path = self.add_curved_corner_to_path(arrow_path,
-                                                        radius,
-                                                        (start_pos[0] + control_offset - radius, start_pos[1]),
-                                                        1,
-                                                        1)
-            arrow_path = self.add_curved_corner_to_path(arrow_path,
-                                                        radius,
-                                                        (start_pos[0] + control_offset,
-                                                         self._start_task.get_positions()['top'][1] + (self._task_gap / 2) - radius),
-                                                        1,
-                                                        0)
-            arrow_path = self.add_curved_corner_to_path(arrow_path,
-                                                        radius,
-                                                        (end_pos[0] - control_offset + radius,
-                                                         self._start_task.get_positions()['top'][1] + (
-                                                                     self._task_gap / 2)),
-                                                        0,
-                                                        2)
-            arrow_path = self.add_curved_corner_to_path(arrow_path,
-                                                        radius,
-                                                        (end_pos[0] - control_offset,
-                                                         end_pos[1] - control_offset + radius),
-                                                        0,
-                                                        3)
-            arrow_path.append((mpath.Path.LINETO, end_pos))
+            buffer.corner(radius, (start_pos[0] + control_offset - radius, start_pos[1]), 1, 1)
+            buffer.corner(radius,
+                          (start_pos[0] + control_offset, start_positions['top'][1] + (self._task_gap / 2) - radius),
+                          1, 0)
+            buffer.corner(radius,
+                          (end_pos[0] - control_offset + radius, start_positions['top'][1] + (self._task_gap / 2)),
+                          0, 2)
+            buffer.corner(radius, (end_pos[0] - control_offset, end_pos[1] - control_offset + radius), 0, 3)
+            buffer.line_to(end_pos)
 
         elif start_pos[0] + control_offset < end_pos[0] - control_offset and start_pos[1] > end_pos[1]:
             # print('Opt 2')
             # The end of the start task is before the start of the end task in the pair
             # Start position is above the end position
-            arrow_path = self.add_curved_corner_to_path(arrow_path,
-                                                        radius,
-                                                        (start_pos[0] + control_offset - radius, start_pos[1]),
-                                                        0,
-                                                        0)
-            arrow_path = self.add_curved_corner_to_path(arrow_path,
-                                                        radius,
-                                                        (start_pos[0] + control_offset,
-                                                         end_pos[1] + control_offset - radius),
-                                                        1,
-                                                        2)
-            arrow_path.append((mpath.Path.LINETO, end_pos))
+            buffer.corner(radius, (start_pos[0] + control_offset - radius, start_pos[1]), 0, 0)
+            buffer.corner(radius, (start_pos[0] + control_offset, end_pos[1] + control_offset - radius), 1, 2)
+            buffer.line_to(end_pos)
 
         elif start_pos[0] + control_offset < end_pos[0] - control_offset and start_pos[1] < end_pos[1]:
             # print('Opt 3')
             # The end of the start task is before the start of the end task in the pair
             # Start position is below the end position
-            arrow_path = self.add_curved_corner_to_path(arrow_path,
-                                                        radius,
-                                                        (start_pos[0] + control_offset - radius, start_pos[1]),
-                                                        1,
-                                                        1)
-            arrow_path = self.add_curved_corner_to_path(arrow_path,
-                                                        radius,
-                                                        (start_pos[0] + control_offset,
-                                                         end_pos[1] -  radius),
-                                                        0,
-                                                        3)
-            arrow_path.append((mpath.Path.LINETO, end_pos))
+            buffer.corner(radius, (start_pos[0] + control_offset - radius, start_pos[1]), 1, 1)
+            buffer.corner(radius, (start_pos[0] + control_offset, end_pos[1] - radius), 0, 3)
+            buffer.line_to(end_pos)
 
         elif start_pos[0] + control_offset == end_pos[0] - control_offset and start_pos[1] > end_pos[1]:
             # print('Opt 4')
             # The end of the start task is aligned with the start of the end task in the pair
             # Start position is above the end position
-            arrow_path = self.add_curved_corner_to_path(arrow_path,
-                                                        radius,
-                                                        (start_pos[0] + control_offset - radius, start_pos[1]),
-                                                        0,
-                                                        0)
-            arrow_path = self.add_curved_corner_to_path(arrow_path,
-                                                        radius,
-                                                        (start_pos[0] + control_offset,
-                                                         end_pos[1] + control_offset - radius),
-                                                        0,
-                                                        2)
-            arrow_path.append((mpath.Path.LINETO, end_pos))
+            buffer.corner(radius, (start_pos[0] + control_offset - radius, start_pos[1]), 0, 0)
+            buffer.corner(radius, (start_pos[0] + control_offset, end_pos[1] + control_offset - radius), 0, 2)
+            buffer.line_to(end_pos)
 
         elif start_pos[0] + control_offset == end_pos[0] - control_offset and start_pos[1] < end_pos[1]:
             # print('Opt 5')
             # The end of the start task is aligned with the start of the end task in the pair
             # Start position is below the end position
-            arrow_path = self.add_curved_corner_to_path(arrow_path,
-                                                        radius,
-                                                        (start_pos[0] + control_offset - radius, start_pos[1]),
-                                                        0,
-                                                        0)
-            arrow_path = self.add_curved_corner_to_path(arrow_path,
-                                                        radius,
-                                                        (start_pos[0] + control_offset,
-                                                         end_pos[1] - control_offset + radius),
-                                                        0,
-                                                        3)
-            arrow_path.append((mpath.Path.LINETO, end_pos))
-
-        # Run through the path and check that none of the vertical lines pass through any task bars
-        found_clash = False
-        for i in range(len(arrow_path) - 1):
-            start_vert = arrow_path[i][1]
-            end_vert = arrow_path[i + 1][1]
+            buffer.corner(radius, (start_pos[0] + control_offset - radius, start_pos[1]), 0, 0)
+            buffer.corner(radius, (start_pos[0] + control_offset, end_pos[1] - control_offset + radius), 0, 3)
+            buffer.line_to(end_pos)
+
+        # Run through the path and check that none of the vertical lines pass through any task bars. Detour corners
+        # are stamped onto the end of the buffer and spliced in through a queue of vertex indices, so the path is
+        # walked segment by segment, detours included, without inserting into the middle of it
+        geom = self._viewer.store
+        starts, tops, bots = geom.start_x, geom.top, geom.bottom
+        order = [0]
+        pending = deque(range(1, len(buffer)))
+        for _ in range(len(buffer) - 1):
+            start_vert = buffer.verts[order[-1]].tolist()
+            end_vert = buffer.verts[pending[0]].tolist()
+            first_corner = len(buffer)
 
             if start_vert[0] == end_vert[0]:  # Vertical line
-                task_clash = [False for tsk in self._viewer.tasks]
-                clash_found = False
-                j = 0
-                for task in self._viewer.tasks:
-                    task_start = task.get_positions()['start']
-                    task_end = task.get_positions()['end']
-                    task_top = task.get_positions()['top']
-                    task_bot = task.get_positions()['bottom']
-                    if task_start[0] < start_vert[0] < task_end[0]:
-                        print('Checking')
-                        if task_bot[1] > min(start_vert[1], end_vert[1]) and \
-                           max(start_vert[1], end_vert[1]) > task_top[1]:
-                            task_clash[j] = True
-                            clash_found = True
-                    j += 1
-                # if not clash_found:
-                #     break
-                #Create a buffer list for additional points in the line path
-                corners = []
+                if self._viewer.stats is not None:
+                    self._viewer.stats.count('clash_checks')
+                clashes = geom.crossing(start_vert[0], start_vert[1], end_vert[1])
+                if not len(clashes):
+                    order.append(pending.popleft())
+                    continue
+                task_clash = set(clashes.tolist())
                 # Upwards vertical
                 if end_vert[1] > start_vert[1]:
-                    for j in range(len(self._viewer.tasks)):
-                        if task_clash[j]:
-                            task_start = self._viewer.tasks[j].get_positions()['start']
-                            task_top = self._viewer.tasks[j].get_positions()['top']
-                            task_bot = self._viewer.tasks[j].get_positions()['bottom']
-                            #Scrolling through the tasks will be correct with the path of the arrow
-                            prev_clash = False
-                            next_clash = False
-                            move_left = False
-                            move_right = False
-                            if j > 0:
-                                prev_clash = task_clash[j - 1]
-                            if j < len(task_clash) - 1:
-                                next_clash = task_clash[j + 1]
-                            #Add additional corners into the path as appropriate
+                    for j in clashes.tolist():
+                        task_start = starts[j]
+                        task_top = tops[j]
+                        task_bot = bots[j]
+                        #Scrolling through the tasks will be correct with the path of the arrow
+                        prev_clash = False
+                        next_clash = False
+                        move_left = False
+                        move_right = False
+                        if j > 0:
+                            prev_clash = j - 1 in task_clash
+                        if j < len(geom) - 1:
+                            next_clash = j + 1 in task_clash
+                        #Add additional corners into the path as appropriate
+                        if not prev_clash:
+                            move_left = True
+                        elif starts[j-1] < task_start:
+                            move_left = True
+                        if not next_clash:
+                            move_right = True
+                        elif starts[j+1] > task_start:
+                            move_right = True
+                        if move_left:
+                            #Corner to move left
                             if not prev_clash:
-                                move_left = True
-                            elif self._viewer.tasks[j-1].get_positions()['start'][0] < task_start[0]:
-                                move_left = True
+                                buffer.corner(radius, ((start_vert[0]), task_bot-control_offset-radius), 0, 1)
+                            elif starts[j - 1] > task_start:
+                                buffer.corner(radius,
+                                              (starts[j - 1] - control_offset, task_top + control_offset + radius),
+                                              0, 1)
+                            buffer.corner(radius, (task_start - control_offset + radius, task_bot - control_offset),
+                                          1, 3)
+                        if move_right:
+                            buffer.corner(radius, (task_start - control_offset, task_top + control_offset - radius),
+                                          1, 2)
                             if not next_clash:
-                                move_right = True
-                            elif self._viewer.tasks[j+1].get_positions()['start'][0] > task_start[0]:
-                                move_right = True
-                            if move_left:
-                                #Corner to move left
-                                if not prev_clash:
-                                    corners = self.add_curved_corner_to_path(corners,
-                                                                             radius,
-                                                                             ((start_vert[0]),
-                                                                              task_bot[1]-control_offset-radius),
-                                                                             0,
-                                                                             1
-                                                                             )
-                                elif self._viewer.tasks[j - 1].get_positions()['start'][0] > task_start[0]:
-                                    corners = self.add_curved_corner_to_path(corners,
-                                                                             radius,
-                                                                             (self._viewer.tasks[j - 1].get_positions()[
-                                                                                  'start'][0] - control_offset,
-                                                                              task_top[1] + control_offset + radius),
-                                                                             0,
-                                                                             1
-                                                                             )
-                                corners = self.add_curved_corner_to_path(corners,
-                                                                         radius,
-                                                                         (task_start[0] - control_offset + radius,
-                                                                          task_bot[1] - control_offset),
-                                                                         1,
-                                                                         3
-                                                                         )
-                            if move_right:
-                                corners = self.add_curved_corner_to_path(corners,
-                                                                         radius,
-                                                                         (task_start[0] - control_offset,
-                                                                          task_top[1] + control_offset - radius),
-                                                                         1,
-                                                                         2
-                                                                         )
-                                if not next_clash:
-                                    corners = self.add_curved_corner_to_path(corners,
-                                                                             radius,
-                                                                             (start_vert[0] - radius,
-                                                                              task_top[1] + control_offset),
-                                                                             0,
-                                                                             0
-                                                                             )
-                                elif self._viewer.tasks[j + 1].get_positions()['start'][0] > task_start[0]:
-                                    corners = self.add_curved_corner_to_path(corners,
-                                                                             radius,
-                                                                             (self._viewer.tasks[j + 1].get_positions()[
-                                                                                  'start'][0] - control_offset - radius,
-                                                                              task_top[1] + control_offset),
-                                                                             0,
-                                                                             0
-                                                                             )
+                                buffer.corner(radius, (start_vert[0] - radius, task_top + control_offset), 0, 0)
+                            elif starts[j + 1] > task_start:
+                                buffer.corner(radius,
+                                              (starts[j + 1] - control_offset - radius, task_top + control_offset),
+                                              0, 0)
                 elif end_vert[1] < start_vert[1]:
-                    for j in reversed(range(len(self._viewer.tasks))):
-                        if task_clash[j]:
-                            task_start = self._viewer.tasks[j].get_positions()['start']
-                            task_top = self._viewer.tasks[j].get_positions()['top']
-                            task_bot = self._viewer.tasks[j].get_positions()['bottom']
-                            # Scrolling through the tasks will be correct with the path of the arrow
-                            prev_clash = False
-                            next_clash = False
-                            move_left = False
-                            move_right = False
-                            if j > 0:
-                                next_clash = task_clash[j - 1]
-                            if j < len(task_clash) - 1:
-                                prev_clash = task_clash[j + 1]
-                            # Add additional corners into the path as appropriate
+                    for j in reversed(clashes.tolist()):
+                        task_start = starts[j]
+                        task_top = tops[j]
+                        task_bot = bots[j]
+                        # Scrolling through the tasks will be correct with the path of the arrow
+                        prev_clash = False
+                        next_clash = False
+                        move_left = False
+                        move_right = False
+                        if j > 0:
+                            next_clash = j - 1 in task_clash
+                        if j < len(geom) - 1:
+                            prev_clash = j + 1 in task_clash
+                        # Add additional corners into the path as appropriate
+                        if not prev_clash:
+                            move_left = True
+                        elif starts[j+1] > task_start:
+                            move_left = True
+                        if not next_clash:
+                            move_right = True
+                        elif starts[j-1] > task_start:
+                            move_right = True
+                        if move_left:
+                            #Corners to move left
                             if not prev_clash:
-                                move_left = True
-                            elif self._viewer.tasks[j+1].get_positions()['start'][0] > task_start[0]:
-                                move_left = True
+                                buffer.corner(radius, ((start_vert[0]), task_top + control_offset + radius), 0, 1)
+                            elif starts[j+1] > task_start:
+                                buffer.corner(radius, (starts[j+1]-control_offset, task_top + control_offset + radius),
+                                              0, 1)
+                            buffer.corner(radius, (task_start - control_offset + radius, task_top + control_offset),
+                                          1, 3)
+                        if move_right:
+                            buffer.corner(radius, (task_start - control_offset, task_bot - control_offset + radius),
+                                          1, 2)
                             if not next_clash:
-                                move_right = True
-                            elif self._viewer.tasks[j-1].get_positions()['start'][0] > task_start[0]:
-                                move_right = True
-                            if move_left:
-                                #Corners to move left
-                                if not prev_clash:
-                                    corners = self.add_curved_corner_to_path(corners,
-                                                                              radius,
-                                                                              ((start_vert[0]),
-                                                                               task_top[1] + control_offset + radius),
-                                                                              0,
-                                                                              1
-                                                                              )
-                                elif self._viewer.tasks[j+1].get_positions()['start'][0] > task_start[0]:
-                                    corners = self.add_curved_corner_to_path(corners,
-                                                                             radius,
-                                                                             (self._viewer.tasks[j+1].get_positions()['start'][0]-control_offset,
-                                                                              task_top[1] + control_offset + radius),
-                                                                             0,
-                                                                             1
-                                                                             )
-                                corners = self.add_curved_corner_to_path(corners,
-                                                                          radius,
-                                                                          (task_start[0] - control_offset + radius,
-                                                                           task_top[1] + control_offset),
-                                                                          1,
-                                                                          3
-                                                                          )
-                            if move_right:
-                                corners = self.add_curved_corner_to_path(corners,
-                                                                          radius,
-                                                                          (task_start[0] - control_offset,
-                                                                           task_bot[1] - control_offset + radius),
-                                                                          1,
-                                                                          2
-                                                                          )
-                                if not next_clash:
-                                    corners = self.add_curved_corner_to_path(corners,
-                                                                              radius,
-                                                                              (start_vert[0] - radius,
-                                                                               task_bot[1] - control_offset),
-                                                                              0,
-                                                                              0
-                                                                              )
-                                elif self._viewer.tasks[j-1].get_positions()['start'][0] > task_start[0]:
-                                    corners = self.add_curved_corner_to_path(corners,
-                                                                             radius,
-                                                                             (self._viewer.tasks[j-1].get_positions()['start'][0] - control_offset - radius,
-                                                                              task_bot[1] - control_offset),
-                                                                             0,
-                                                                             0
-                                                                             )
-                for j in range(len(corners)):
-                    arrow_path.insert(i+1+j,corners[j])
-
-        codes, verts = zip(*arrow_path)
-        path = mpath.Path(verts, codes)
-        patch = patches.PathPatch(path, edgecolor='gray', linewidth=1.5, facecolor='none')
-        ax.add_patch(patch)
+                                buffer.corner(radius, (start_vert[0] - radius, task_bot - control_offset), 0, 0)
+                            elif starts[j-1] > task_start:
+                                buffer.corner(radius,
+                                              (starts[j-1] - control_offset - radius, task_bot - control_offset),
+                                              0, 0)
+            pending.extendleft(reversed(range(first_corner, len(buffer))))
+            order.append(pending.popleft())
+        order.extend(pending)
+
+        self.path = buffer.path(order)
+        self.head = ((end_pos[0] - control_offset, end_pos[1]), end_pos)
+        if cache is not None:
+            cache.put(key, (self.path, self.head))
+        return self.path
+
+    def draw(self, ax, autolim=True):
+        """ Function to draw the dependency arrow
+
+        :param ax: Axes to draw the dependency arrow
+        :param autolim: Whether to expand the data limits of the axes to include the arrow
+        :return:
+        """
+        self.route()
+        self._add_artists(ax, autolim)
+
+    def _add_artists(self, ax, autolim=True):
+        """ Create the line and head artists for the routed path
+
+        :param ax: Axes to draw the dependency arrow
+        :param autolim: Whether to expand the data limits of the axes to include the arrow
+        :return: None
+        """
+        patch = patches.PathPatch(self.path, edgecolor=self.colour, linewidth=1.5, facecolor='none')
+        add = ax.add_patch if autolim else ax.add_artist
+        add(patch)
 
         # Add arrow head
-        arrow = patches.FancyArrowPatch((end_pos[0] - control_offset, end_pos[1]), end_pos,
-                                        mutation_scale=20, color='gray', arrowstyle='->')
-        ax.add_patch(arrow)
+        arrow = patches.FancyArrowPatch(*self.head, mutation_scale=20, color=self.colour, arrowstyle='->')
+        add(arrow)
 
         self.arrow_patch = (patch, arrow)
 
-        # Connect hover event for the arrow
-        self.connect_hover_event(ax)
-
-    def connect_hover_event(self, ax):
-        def on_hover(event):
-            if self.arrow_patch[0].contains(event)[0]:
-                self.arrow_patch[0].set_linewidth(3.0)  # Increase line thickness on hover
-                ax.figure.canvas.draw_idle()
-            else:
-                self.arrow_patch[0].set_linewidth(1.5)  # Revert line thickness when not hovering
-                ax.figure.canvas.draw_idle()
+    def set_hover(self, hover):
+        """ Thicken the arrow line while the mouse is over it
 
-        self.arrow_patch[0].figure.canvas.mpl_connect('motion_notify_event', on_hover)
+        :param hover: True if the mouse is over the arrow
+        :return: None
+        """
+        self.arrow_patch[0].set_linewidth(3.0 if hover else 1.5)
 
     def remove(self, ax):
+        """ Remove the arrow's line and head from the axes they were drawn on
+
+        :param ax: Axes the arrow was drawn on
+        :return: None
+        """
         if self.arrow_patch:
-            patch, arrow = self.arrow_patch
-            ax.patches.remove(patch)
-            ax.patches.remove(arrow)
+            for artist in self.arrow_patch:
+                artist.remove()
+            self.arrow_patch = None
 
@@ -1,27 +1,116 @@
+import os
 import sys
-from PyQt5.QtWidgets import QApplication, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QLabel, QWidget, QScrollArea
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtWidgets import QApplication, QVBoxLayout, QHBoxLayout, QTableView, QPushButton, QWidget
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-from GanttViewer import GanttViewer, GTask  # Assuming GanttViewer is correctly imported
-from datetime import datetime
+from GanttViewer import GanttViewer, GTask
+from GanttLoader import GScheduleLoader
+from GanttSnapshot import load_snapshot
+
+
+class GanttTaskModel(QAbstractTableModel):
+    """ Table model that reads cells lazily from the viewer's task store and writes edits straight back into it,
+    so the view only ever touches the rows on screen
+    """
+    HEADERS = ['Task Name', 'Start Date', 'End Date']
+
+    def __init__(self, viewer, parent=None):
+        """ Task table model
+
+        :param viewer: Gantt chart viewer whose tasks are shown
+        :param parent: Parent Qt object
+        """
+        super().__init__(parent)
+        self.viewer = viewer
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.viewer.store)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemIsEditable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        task = self.viewer.tasks[index.row()]
+        if index.column() == 0:
+            return task.name
+        if index.column() == 1:
+            return task.start.strftime('%Y-%m-%d')
+        return task.end.strftime('%Y-%m-%d')
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        task = self.viewer.tasks[index.row()]
+        try:
+            if index.column() == 0:
+                task.name = value
+            elif index.column() == 1:
+                task.start = value
+            else:
+                task.end = value
+        except ValueError:
+            return False
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def append_task(self, task):
+        """ Add a task to the viewer as a new row at the bottom of the table
+
+        :param task: Task to add
+        :return: None
+        """
+        row = self.rowCount()
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.viewer.add_task(task)
+        self.endInsertRows()
+
+    def append_tasks(self, tasks):
+        """ Add many tasks to the viewer as new rows at the bottom of the table
+
+        :param tasks: List of tasks to add
+        :return: List of the tasks added
+        """
+        if not tasks:
+            return tasks
+        row = self.rowCount()
+        self.beginInsertRows(QModelIndex(), row, row + len(tasks) - 1)
+        tasks = self.viewer.add_tasks(tasks)
+        self.endInsertRows()
+        return tasks
+
 
 class GanttApp(QWidget):
-    def __init__(self):
+    def __init__(self, schedule=None):
         super().__init__()
         self.setWindowTitle('Project Management Gantt Viewer')
         self.setGeometry(100, 100, 1200, 800)
 
-        self.gantt_viewer = GanttViewer(figsize=(10, 6))
-        self.populate_initial_tasks()
+        # A directory is a snapshot saved by GanttSnapshot, which opens without parsing or routing anything
+        snapshot = schedule is not None and os.path.isdir(schedule)
+        if snapshot:
+            self.gantt_viewer = load_snapshot(schedule, figsize=(10, 6), blit=True, embedded=True)
+        else:
+            self.gantt_viewer = GanttViewer(figsize=(10, 6), render_mode='collection', blit=True, embedded=True)
+        if schedule is None:
+            self.populate_initial_tasks()
 
         # Main Layout
         main_layout = QHBoxLayout()
 
-        # Task Editor Table
-        self.task_table = QTableWidget()
-        self.task_table.setColumnCount(3)
-        self.task_table.setHorizontalHeaderLabels(['Task Name', 'Start Date', 'End Date'])
-        self.populate_task_table()
+        # Task Editor Table, a view over the viewer's task store
+        self.task_model = GanttTaskModel(self.gantt_viewer, self)
+        self.task_table = QTableView()
+        self.task_table.setModel(self.task_model)
         main_layout.addWidget(self.task_table)
 
         # Button Layout
@@ -37,60 +126,41 @@ class GanttApp(QWidget):
         button_layout.addStretch()
         main_layout.addLayout(button_layout)
 
-        # Gantt Chart Layout
+        # Gantt Chart Layout, the canvas is created once and redrawn in place
         self.chart_layout = QVBoxLayout()
+        self.canvas = FigureCanvas(self.gantt_viewer.fig)
+        self.chart_layout.addWidget(self.canvas)
         main_layout.addLayout(self.chart_layout)
         self.draw_gantt_chart()
 
         self.setLayout(main_layout)
 
+        # Stream a schedule file in the background, the chart and table grow a chunk at a time
+        self.loader = None
+        if schedule is not None and not snapshot:
+            self.loader = GScheduleLoader(self.gantt_viewer, schedule, add_tasks=self.task_model.append_tasks)
+            self.loader.attach()
+
     def populate_initial_tasks(self):
         # Populate GanttViewer with example tasks
-        self.gantt_viewer.add_task(GTask('Task A', '2024-11-01', '2024-11-10'))
-        self.gantt_viewer.add_task(GTask('Task B', '2024-11-05', '2024-11-15'))
-        self.gantt_viewer.add_task(GTask('Task C', '2024-11-12', '2024-11-20'))
-
-    def populate_task_table(self):
-        self.task_table.setRowCount(len(self.gantt_viewer.tasks))
-        for row, task in enumerate(self.gantt_viewer.tasks):
-            self.task_table.setItem(row, 0, QTableWidgetItem(task.name))
-            self.task_table.setItem(row, 1, QTableWidgetItem(task.start.strftime('%Y-%m-%d')))
-            self.task_table.setItem(row, 2, QTableWidgetItem(task.end.strftime('%Y-%m-%d')))
+        self.gantt_viewer.add_tasks([GTask('Task A', '2024-11-01', '2024-11-10'),
+                                     GTask('Task B', '2024-11-05', '2024-11-15'),
+                                     GTask('Task C', '2024-11-12', '2024-11-20')])
 
     def update_gantt_chart(self):
-        # Clear existing tasks and add updated ones
-        self.gantt_viewer.tasks = []
-        for row in range(self.task_table.rowCount()):
-            task_name = self.task_table.item(row, 0).text()
-            start_date = self.task_table.item(row, 1).text()
-            end_date = self.task_table.item(row, 2).text()
-            self.gantt_viewer.add_task(GTask(task_name, start_date, end_date))
+        # Edits in the table are already written into the viewer's tasks, so only the chart needs redrawing
         self.draw_gantt_chart()
 
     def add_new_task(self):
-        row_position = self.task_table.rowCount()
-        self.task_table.insertRow(row_position)
-        self.task_table.setItem(row_position, 0, QTableWidgetItem('New Task'))
-        self.task_table.setItem(row_position, 1, QTableWidgetItem('2024-11-25'))
-        self.task_table.setItem(row_position, 2, QTableWidgetItem('2024-12-05'))
+        self.task_model.append_task(GTask('New Task', '2024-11-25', '2024-12-05'))
 
     def draw_gantt_chart(self):
-        # Clear previous chart
-        while self.chart_layout.count():
-            child = self.chart_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        # Use GanttViewer to create the figure
-        fig = self.gantt_viewer.fig
+        # Redraw the existing canvas rather than building a new one
         self.gantt_viewer.draw()
-
-        # Add the figure to the canvas
-        canvas = FigureCanvas(fig)
-        self.chart_layout.addWidget(canvas)
+        self.canvas.draw_idle()
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
-    window = GanttApp()
+    window = GanttApp(sys.argv[1] if len(sys.argv) > 1 else None)
     window.show()
     sys.exit(app.exec_())